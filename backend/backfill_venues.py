@@ -0,0 +1,37 @@
+import asyncio
+from server import connect_mongo
+
+client, db = connect_mongo()
+
+
+async def backfill_venue_geo():
+    # Derive the GeoJSON point from the stored coordinates in one server-side update
+    result = await db.venues.update_many(
+        {
+            "latitude": {"$type": "number"},
+            "longitude": {"$type": "number"},
+            "geo": {"$exists": False}
+        },
+        [{"$set": {"geo": {"type": "Point", "coordinates": ["$longitude", "$latitude"]}}}]
+    )
+    print(f"Backfilled geo point on {result.modified_count} venues")
+
+
+async def backfill_location_key():
+    # Must match server.normalize_location (strip + lowercase)
+    result = await db.venues.update_many(
+        {"location": {"$type": "string"}, "location_key": {"$exists": False}},
+        [{"$set": {"location_key": {"$toLower": {"$trim": {"input": "$location"}}}}}]
+    )
+    print(f"Backfilled location_key on {result.modified_count} venues")
+
+
+async def main():
+    print("Starting venue backfill...")
+    await backfill_venue_geo()
+    await backfill_location_key()
+    print("Venue backfill completed!")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+import argparse
+import timeit
+from datetime import datetime, timezone
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from server import FastJSONResponse, json_backend, std_json_dumps
+
+
+def make_venue(i):
+    return {
+        "_id": ObjectId(),
+        "name": f"Venue {i}",
+        "description": "Premium 5-a-side and 7-a-side football turf with floodlights.",
+        "location": "Bangalore",
+        "location_key": "bangalore",
+        "address": f"{i} MG Road, Bangalore, Karnataka 560001",
+        "owner_id": f"owner{i % 50}",
+        "categories": ["football", "cricket"],
+        "amenities": ["Floodlights", "Parking", "Washroom", "Changing Room", "Water"],
+        "price_per_hour": 1500.0,
+        "images": [],
+        "rating": 4.5,
+        "rating_sum": 540.0,
+        "total_reviews": 120,
+        "latitude": 12.9755,
+        "longitude": 77.6069,
+        "geo": {"type": "Point", "coordinates": [77.6069, 12.9755]},
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def make_booking(i):
+    return {
+        "_id": ObjectId(),
+        "user_id": f"user_{i % 1000:012d}",
+        "venue_id": str(ObjectId()),
+        "venue_name": f"Venue {i % 100}",
+        "booking_date": "2026-10-20",
+        "start_time": "18:00",
+        "end_time": "19:00",
+        "phone_number": "9876543210",
+        "total_price": 1500.0,
+        "status": "confirmed",
+        "payment_status": "completed",
+        "payment_id": f"pay_{i}",
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def current_path(docs):
+    # What list endpoints did before: rewrite _id, jsonable_encoder, stdlib json
+    for doc in docs:
+        doc["_id"] = str(doc["_id"])
+    return std_json_dumps(jsonable_encoder(docs))
+
+
+def fast_path(docs):
+    return FastJSONResponse(docs).body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON encoding paths for list responses")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Fast path backend: {json_backend}")
+    print(f"{'documents':<20}{'current (ms)':>15}{'fast (ms)':>15}{'speedup':>10}")
+    for kind, factory in [("venues", make_venue), ("bookings", make_booking)]:
+        for size in (100, 1000, 10000):
+            docs = [factory(i) for i in range(size)]
+            # current_path mutates _id, so each run gets fresh copies
+            current = min(timeit.repeat(
+                lambda: current_path([dict(d) for d in docs]), number=1, repeat=args.repeat
+            ))
+            copy_cost = min(timeit.repeat(lambda: [dict(d) for d in docs], number=1, repeat=args.repeat))
+            fast = min(timeit.repeat(lambda: fast_path(docs), number=1, repeat=args.repeat))
+            current -= copy_cost
+            print(f"{f'{size} {kind}':<20}{current * 1000:>15.2f}{fast * 1000:>15.2f}{current / fast:>9.1f}x")
+
+if __name__ == "__main__":
+    main()
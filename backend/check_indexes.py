@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+from server import connect_mongo, INDEXES, ensure_indexes
+
+client, db = connect_mongo()
+
+
+def index_key(key_spec, weights=None):
+    # MongoDB stores a text index's fields as ("_fts", "text"), ("_ftsx", 1)
+    # and lists them in its weights, so both sides fold them the same way
+    key, text_fields = [], sorted(weights or {})
+    for field, direction in key_spec:
+        if field == "_ftsx":
+            continue
+        if direction == "text" and field != "_fts":
+            text_fields.append(field)
+            field = "_fts"
+        if (field, direction) not in key:
+            key.append((field, direction))
+    return tuple(key), tuple(sorted(text_fields))
+
+
+async def find_missing_indexes():
+    missing = []
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        existing_keys = {index_key(info["key"], info.get("weights")) for info in existing.values()}
+        for index in indexes:
+            if index_key(index.document["key"].items()) not in existing_keys:
+                missing.append((collection, index.document["name"]))
+    return missing
+
+
+async def find_unused_indexes():
+    unused = []
+    for collection in await db.list_collection_names():
+        async for stat in db[collection].aggregate([{"$indexStats": {}}]):
+            if stat["name"] == "_id_":
+                continue
+            if stat["accesses"]["ops"] == 0:
+                unused.append((collection, stat["name"], stat["accesses"]["since"]))
+    return unused
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Report missing and unused MongoDB indexes")
+    parser.add_argument("--create", action="store_true", help="create any missing indexes")
+    args = parser.parse_args()
+
+    missing = await find_missing_indexes()
+    if missing:
+        print(f"Missing indexes ({len(missing)}):")
+        for collection, name in missing:
+            print(f"  {collection}.{name}")
+    else:
+        print("All declared indexes are present")
+
+    # Access counters reset on mongod restart, so "unused" is relative to `since`
+    unused = await find_unused_indexes()
+    if unused:
+        print(f"Unused indexes ({len(unused)}):")
+        for collection, name, since in unused:
+            print(f"  {collection}.{name} (no accesses since {since})")
+    else:
+        print("No unused indexes")
+
+    if args.create and missing:
+        print("Creating missing indexes...")
+        await ensure_indexes()
+        print("Done!")
+
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+import asyncio
+from server import connect_mongo, booking_view_filing_stages, BOOKING_VIEW_FIELDS, UPCOMING_BOOKING_STATUSES
+
+client, db = connect_mongo()
+
+
+# Rebuilds every user's booking view from the bookings collection in one
+# aggregation, merging the result over user_booking_views by user_id.
+# Bookings are grouped oldest first so capping past keeps the newest entries
+REBUILD_PIPELINE = [
+    {"$sort": {"booking_date": 1, "_id": 1}},
+    {"$group": {
+        "_id": "$user_id",
+        "bookings": {"$push": {
+            "_id": {"$toString": "$_id"},
+            **{field: f"${field}" for field in BOOKING_VIEW_FIELDS}
+        }}
+    }},
+    {"$project": {
+        "_id": 0,
+        "user_id": "$_id",
+        "upcoming": {"$filter": {
+            "input": "$bookings",
+            "cond": {"$in": ["$$this.status", UPCOMING_BOOKING_STATUSES]}
+        }},
+        "past": {"$filter": {
+            "input": "$bookings",
+            "cond": {"$not": [{"$in": ["$$this.status", UPCOMING_BOOKING_STATUSES]}]}
+        }},
+        "complete": {"$literal": True},
+        "updated_at": "$$NOW"
+    }},
+    *booking_view_filing_stages(),
+    {"$merge": {
+        "into": "user_booking_views",
+        "on": "user_id",
+        "whenMatched": "replace",
+        "whenNotMatched": "insert"
+    }}
+]
+
+
+async def main():
+    print("Rebuilding user booking views...")
+    # $merge on user_id needs the unique index to exist
+    await db.user_booking_views.create_index("user_id", name="user_id_unique", unique=True)
+    await db.bookings.aggregate(REBUILD_PIPELINE).to_list(None)
+    print(f"Booking views now cover {await db.user_booking_views.count_documents({})} users")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+from bson import ObjectId
+from server import connect_mongo
+
+client, db = connect_mongo()
+
+
+# Groups all reviews per venue and merges rating/rating_sum/total_reviews
+# straight into the venue documents in a single server-side pass
+REBUILD_PIPELINE = [
+    {"$group": {
+        "_id": "$venue_id",
+        "rating_sum": {"$sum": "$rating"},
+        "total_reviews": {"$sum": 1}
+    }},
+    {"$project": {
+        "_id": {"$convert": {"input": "$_id", "to": "objectId", "onError": None, "onNull": None}},
+        "rating_sum": 1,
+        "total_reviews": 1,
+        "rating": {"$divide": ["$rating_sum", "$total_reviews"]}
+    }},
+    {"$match": {"_id": {"$ne": None}}},
+    {"$merge": {
+        "into": "venues",
+        "on": "_id",
+        "whenMatched": "merge",
+        "whenNotMatched": "discard"
+    }}
+]
+
+
+async def rebuild_ratings(reset_unreviewed: bool):
+    if reset_unreviewed:
+        reviewed = await db.reviews.distinct("venue_id")
+        reviewed_ids = [ObjectId(v) for v in reviewed if ObjectId.is_valid(v)]
+        result = await db.venues.update_many(
+            {"_id": {"$nin": reviewed_ids}},
+            {"$set": {"rating": 0.0, "rating_sum": 0.0, "total_reviews": 0}}
+        )
+        print(f"Reset {result.modified_count} venues without reviews")
+
+    await db.reviews.aggregate(REBUILD_PIPELINE).to_list(None)
+    print("Recomputed ratings for all reviewed venues")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Recompute venue ratings from reviews")
+    parser.add_argument(
+        "--reset-unreviewed",
+        action="store_true",
+        help="also zero the rating of venues that have no reviews"
+    )
+    args = parser.parse_args()
+
+    print("Rebuilding venue ratings...")
+    await rebuild_ratings(args.reset_unreviewed)
+    print("Rating rebuild completed!")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
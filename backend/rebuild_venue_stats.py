@@ -0,0 +1,18 @@
+import asyncio
+from server import connect_mongo, rollup_pipeline
+
+client, db = connect_mongo()
+
+
+async def main():
+    print("Rebuilding venue daily stats...")
+    # $merge on (venue_id, date) needs the unique index to exist
+    await db.venue_daily_stats.create_index(
+        [("venue_id", 1), ("date", 1)], name="venue_date_unique", unique=True
+    )
+    await db.bookings.aggregate(rollup_pipeline()).to_list(None)
+    print(f"Venue stats now cover {await db.venue_daily_stats.count_documents({})} venue days")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
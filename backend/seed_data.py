@@ -1,15 +1,8 @@
 import asyncio
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
-from dotenv import load_dotenv
-from pathlib import Path
+from server import connect_mongo
 
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
-
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Same pool settings as the API (MONGO_* in .env)
+client, db = connect_mongo()
 
 async def seed_venues():
     # Clear existing data
@@ -22,6 +15,8 @@ async def seed_venues():
             "description": "Premium 5-a-side and 7-a-side football turf with floodlights. Perfect for evening matches with friends or tournaments.",
             "location": "Bangalore",
             "address": "123 MG Road, Bangalore, Karnataka 560001",
+            "latitude": 12.9755,
+            "longitude": 77.6069,
             "owner_id": "owner1",
             "categories": ["football"],
             "amenities": ["Floodlights", "Parking", "Washroom", "Changing Room", "Water"],
@@ -35,6 +30,8 @@ async def seed_venues():
             "description": "Professional cricket practice nets with bowling machine. Great for practice sessions and coaching.",
             "location": "Bangalore",
             "address": "456 Indiranagar, Bangalore, Karnataka 560038",
+            "latitude": 12.9784,
+            "longitude": 77.6408,
             "owner_id": "owner1",
             "categories": ["cricket"],
             "amenities": ["Bowling Machine", "Nets", "Parking", "Washroom", "Seating Area"],
@@ -48,6 +45,8 @@ async def seed_venues():
             "description": "Premium gaming cafe with PS5 consoles and high-end gaming PCs. Comfortable gaming chairs and AC environment.",
             "location": "Bangalore",
             "address": "789 Koramangala, Bangalore, Karnataka 560034",
+            "latitude": 12.9352,
+            "longitude": 77.6245,
             "owner_id": "owner2",
             "categories": ["gaming"],
             "amenities": ["PS5", "Gaming PC", "AC", "High-Speed Internet", "Snacks & Drinks"],
@@ -61,6 +60,8 @@ async def seed_venues():
             "description": "Multi-sport venue with football, cricket, and badminton facilities. Perfect for all sports enthusiasts.",
             "location": "Mumbai",
             "address": "321 Bandra West, Mumbai, Maharashtra 400050",
+            "latitude": 19.0596,
+            "longitude": 72.8295,
             "owner_id": "owner2",
             "categories": ["football", "cricket", "other"],
             "amenities": ["Multi-Sport", "Floodlights", "Parking", "Washroom", "Cafeteria"],
@@ -74,6 +75,8 @@ async def seed_venues():
             "description": "Luxury gaming experience with latest games, comfortable seating, and tournament hosting capabilities.",
             "location": "Mumbai",
             "address": "654 Andheri, Mumbai, Maharashtra 400053",
+            "latitude": 19.1136,
+            "longitude": 72.8697,
             "owner_id": "owner3",
             "categories": ["gaming"],
             "amenities": ["PS5", "Gaming PC", "AC", "Tournament Setup", "Food & Beverages"],
@@ -87,6 +90,8 @@ async def seed_venues():
             "description": "Well-maintained artificial turf for football enthusiasts. Available for 5v5 and 7v7 formats.",
             "location": "Delhi",
             "address": "987 Connaught Place, Delhi 110001",
+            "latitude": 28.6315,
+            "longitude": 77.2167,
             "owner_id": "owner3",
             "categories": ["football"],
             "amenities": ["Artificial Turf", "Floodlights", "Parking", "Washroom", "First Aid"],
@@ -97,6 +102,12 @@ async def seed_venues():
         }
     ]
     
+    # GeoJSON point for nearby search ([longitude, latitude] order) and the
+    # normalized key used for location prefix search
+    for venue in venues:
+        venue["geo"] = {"type": "Point", "coordinates": [venue["longitude"], venue["latitude"]]}
+        venue["location_key"] = venue["location"].strip().lower()
+    
     result = await db.venues.insert_many(venues)
     print(f"Inserted {len(result.inserted_ids)} venues")
     
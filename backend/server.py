@@ -1,32 +1,391 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response, Depends
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, APIRouter, HTTPException, Header, Query, Request, Response, Depends
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, DeleteMany, IndexModel, ReturnDocument, UpdateMany, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
 from passlib.context import CryptContext
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, NamedTuple, Optional
+from collections import Counter, OrderedDict, deque
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import random
+import socket
+import threading
+import time
+import contextvars
+import sys
 import uuid
 from datetime import datetime, timezone, timedelta
-from bson import ObjectId
+from bson import ObjectId, json_util
 import httpx
+import base64
+import hashlib
+import csv
+import io
+import json
+import re
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# MongoDB connection settings
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+MONGO_DB_NAME = os.environ['DB_NAME']
+MONGO_MAX_POOL_SIZE = int(os.environ.get('MONGO_MAX_POOL_SIZE', '100'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '0'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '5000'))
+MONGO_READ_CONCERN = os.environ.get('MONGO_READ_CONCERN')  # e.g. 'local', 'majority'
+MONGO_WRITE_CONCERN = os.environ.get('MONGO_WRITE_CONCERN')  # e.g. '1', 'majority'
+
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+SIZE_BUCKETS_BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Per-request accumulator of Mongo command time (ms), set by the request
+# metrics middleware. Motor copies the context into its executor threads, so
+# command events published there still see the current request's accumulator.
+request_db_time = contextvars.ContextVar("request_db_time", default=None)
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket upper bounds (milliseconds by default)."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS_MS):
+        self.bounds = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+        self.sum += value
+
+    def cumulative_buckets(self) -> list:
+        cumulative, buckets = 0, []
+        for bound, count in zip([*self.bounds, "+Inf"], self.counts):
+            cumulative += count
+            buckets.append((str(bound), cumulative))
+        return buckets
+
+    def snapshot(self) -> dict:
+        return {"count": self.total, "sum": round(self.sum, 3), "buckets": dict(self.cumulative_buckets())}
+
+
+class MongoMonitor(monitoring.CommandListener, monitoring.ConnectionPoolListener):
+    """Collects command latency and connection pool usage from pymongo events.
+
+    pymongo publishes events from Motor's worker threads, so all state is
+    guarded by a lock. Checkout wait time is measured per thread between the
+    checkout-started and checked-out events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.command_latency: dict = {}
+        self.command_failures = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checkout_wait = Histogram()
+        self.pool_clears = 0
+
+    # Command events
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record_command(event)
+
+    def failed(self, event):
+        with self._lock:
+            self.command_failures += 1
+        self._record_command(event)
+
+    def _record_command(self, event):
+        duration_ms = event.duration_micros / 1000
+        db_time = request_db_time.get()
+        with self._lock:
+            self.command_latency.setdefault(event.command_name, Histogram()).observe(duration_ms)
+            if db_time is not None:
+                db_time[0] += duration_ms
+
+    # Connection pool events
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, "checkout_started", None)
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+            if started is not None:
+                self.checkout_wait.observe((time.perf_counter() - started) * 1000)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pool": {
+                    "max_size": MONGO_MAX_POOL_SIZE,
+                    "min_size": MONGO_MIN_POOL_SIZE,
+                    "checked_out": self.checked_out,
+                    "checkouts": self.checkouts,
+                    "checkout_failures": self.checkout_failures,
+                    "checkout_wait_ms": self.checkout_wait.snapshot(),
+                    "clears": self.pool_clears,
+                },
+                "commands": {
+                    "failures": self.command_failures,
+                    "latency_ms": {name: h.snapshot() for name, h in self.command_latency.items()},
+                },
+            }
+
+
+mongo_monitor = MongoMonitor()
+
+# Created by connect_mongo() from the app lifespan (or by a CLI script)
+client: Optional[AsyncIOMotorClient] = None
+db = None
+
+
+def mongo_client_options() -> dict:
+    options = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "event_listeners": [mongo_monitor],
+    }
+    if MONGO_READ_CONCERN:
+        options["readConcernLevel"] = MONGO_READ_CONCERN
+    if MONGO_WRITE_CONCERN:
+        options["w"] = int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+    return options
+
+
+def connect_mongo():
+    global client, db
+    client = AsyncIOMotorClient(mongo_url, **mongo_client_options())
+    db = client[MONGO_DB_NAME]
+    return client, db
+
+
+def close_mongo():
+    global client, db
+    if client is not None:
+        client.close()
+    client = db = None
+
+# Session cache settings. Logout only clears the cache of the worker that
+# handled it, so the TTL bounds how long other workers keep accepting the token
+SESSION_CACHE_SIZE = int(os.environ.get('SESSION_CACHE_SIZE', '10000'))
+SESSION_CACHE_TTL = float(os.environ.get('SESSION_CACHE_TTL', '5'))
+
+# Venue search cache settings
+SEARCH_CACHE_SIZE = int(os.environ.get('SEARCH_CACHE_SIZE', '1000'))
+SEARCH_CACHE_TTL = float(os.environ.get('SEARCH_CACHE_TTL', '30'))
+
+# Per venue/day availability cache settings
+AVAILABILITY_CACHE_SIZE = int(os.environ.get('AVAILABILITY_CACHE_SIZE', '5000'))
+AVAILABILITY_CACHE_TTL = float(os.environ.get('AVAILABILITY_CACHE_TTL', '30'))
+AVAILABILITY_BATCH_MAX_VENUES = 50
+AVAILABILITY_BATCH_MAX_DAYS = 31
+
+# Venue name/pricing/hours snapshot cache settings. update_venue only clears
+# the snapshot on its own worker, so the TTL is how long other workers may
+# keep pricing bookings at the previous rate
+VENUE_SNAPSHOT_CACHE_SIZE = int(os.environ.get('VENUE_SNAPSHOT_CACHE_SIZE', '5000'))
+VENUE_SNAPSHOT_CACHE_TTL = float(os.environ.get('VENUE_SNAPSHOT_CACHE_TTL', '5'))
+
+# Bulk slot generation limits
+SLOT_BULK_MAX_DAYS = 92
+SLOT_BULK_MAX_SLOTS = 10000
+SLOT_BULK_BATCH_SIZE = 500
+
+# Bulk booking status/payment update limit
+BOOKING_BULK_MAX_UPDATES = 500
+
+# Past entries kept per user booking view; older ones are read from bookings
+BOOKING_VIEW_PAST_LIMIT = int(os.environ.get('BOOKING_VIEW_PAST_LIMIT', '200'))
+
+# Live availability feed (server-sent events) settings
+AVAILABILITY_FEED_POLL_SECONDS = float(os.environ.get('AVAILABILITY_FEED_POLL_SECONDS', '5'))
+AVAILABILITY_FEED_KEEPALIVE_SECONDS = float(os.environ.get('AVAILABILITY_FEED_KEEPALIVE_SECONDS', '15'))
+AVAILABILITY_FEED_MAX_SUBSCRIBERS = int(os.environ.get('AVAILABILITY_FEED_MAX_SUBSCRIBERS', '1000'))
+AVAILABILITY_FEED_QUEUE_SIZE = 8
+
+# Owner dashboard rollup settings
+ROLLUP_FLUSH_SECONDS = float(os.environ.get('ROLLUP_FLUSH_SECONDS', '5'))
+ROLLUP_BATCH_SIZE = 100
+DASHBOARD_MAX_DAYS = 366
+
+# Indexes backing the queries below, created idempotently at startup
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    "user_sessions": [
+        IndexModel([("session_token", ASCENDING)], name="session_token_unique", unique=True),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "venues": [
+        IndexModel([("owner_id", ASCENDING)], name="owner_id"),
+        IndexModel([("geo", GEOSPHERE)], name="geo_2dsphere"),
+        IndexModel([("location_key", ASCENDING)], name="location_key"),
+        IndexModel(
+            [("name", TEXT), ("description", TEXT), ("amenities", TEXT)],
+            name="venue_text",
+            weights={"name": 10, "amenities": 3, "description": 1}
+        ),
+    ],
+    "slots": [
+        IndexModel(
+            [("venue_id", ASCENDING), ("booking_date", ASCENDING), ("status", ASCENDING),
+             ("start_time", ASCENDING)],
+            name="venue_date_status_start"
+        ),
+        # One slot document per venue/date/start time; reservations rely on it
+        IndexModel(
+            [("venue_id", ASCENDING), ("booking_date", ASCENDING), ("start_time", ASCENDING)],
+            name="venue_date_start_unique",
+            unique=True
+        ),
+        IndexModel([("status", ASCENDING), ("held_until", ASCENDING)], name="status_held_until"),
+    ],
+    "bookings": [
+        IndexModel(
+            [("user_id", ASCENDING), ("status", ASCENDING), ("booking_date", DESCENDING)],
+            name="user_status_date"
+        ),
+        IndexModel(
+            [("venue_id", ASCENDING), ("booking_date", DESCENDING), ("_id", DESCENDING)],
+            name="venue_date_id"
+        ),
+    ],
+    "user_booking_views": [
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    ],
+    "venue_daily_stats": [
+        IndexModel([("venue_id", ASCENDING), ("date", ASCENDING)], name="venue_date_unique", unique=True),
+    ],
+    "reviews": [
+        IndexModel(
+            [("venue_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="venue_created_id"
+        ),
+    ],
+    "idempotency_keys": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+
+# Slot reservation is only safe with this index in place; see claim_interval()
+REQUIRED_INDEXES = {("slots", "venue_date_start_unique")}
+
+
+async def ensure_indexes():
+    # One index at a time so a single conflict (e.g. duplicate emails in
+    # legacy data) doesn't prevent the remaining indexes from being built
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                await db[collection].create_indexes([index])
+            except Exception as e:
+                if (collection, name) in REQUIRED_INDEXES:
+                    raise RuntimeError(
+                        f"Required index {name} on {collection} could not be built ({e}); "
+                        "remove duplicate documents and restart"
+                    ) from e
+                logger.warning("Could not create index %s on %s: %s", name, collection, e)
+
+
+# Slot holds placed by create_booking expire if payment doesn't complete
+SLOT_HOLD_MINUTES = int(os.environ.get('SLOT_HOLD_MINUTES', '10'))
+SLOT_HOLD_SWEEP_SECONDS = int(os.environ.get('SLOT_HOLD_SWEEP_SECONDS', '60'))
+
+# Background scheduler settings
+SCHEDULER_ENABLED = os.environ.get('SCHEDULER_ENABLED', 'true').lower() == 'true'
+SCHEDULER_LEASE_SECONDS = int(os.environ.get('SCHEDULER_LEASE_SECONDS', '30'))
+BOOKING_SWEEP_SECONDS = int(os.environ.get('BOOKING_SWEEP_SECONDS', '300'))
+BOOKING_SWEEP_BATCH_SIZE = int(os.environ.get('BOOKING_SWEEP_BATCH_SIZE', '500'))
+PENDING_BOOKING_MINUTES = int(os.environ.get('PENDING_BOOKING_MINUTES', os.environ.get('SLOT_HOLD_MINUTES', '10')))
+
+# Idempotency-Key settings for booking and payment writes
+IDEMPOTENCY_TTL_HOURS = float(os.environ.get('IDEMPOTENCY_TTL_HOURS', '24'))
+IDEMPOTENCY_LOCK_SECONDS = int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', '60'))
+IDEMPOTENCY_CACHE_SIZE = int(os.environ.get('IDEMPOTENCY_CACHE_SIZE', '10000'))
+
+# Outbound OAuth provider settings
+OAUTH_SESSION_URL = os.environ.get(
+    'OAUTH_SESSION_URL',
+    'https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data'
+)
+OAUTH_CONNECT_TIMEOUT = float(os.environ.get('OAUTH_CONNECT_TIMEOUT', '3'))
+OAUTH_READ_TIMEOUT = float(os.environ.get('OAUTH_READ_TIMEOUT', '5'))
+OAUTH_MAX_RETRIES = int(os.environ.get('OAUTH_MAX_RETRIES', '2'))
+OAUTH_MAX_CONNECTIONS = int(os.environ.get('OAUTH_MAX_CONNECTIONS', '20'))
+OAUTH_BREAKER_THRESHOLD = int(os.environ.get('OAUTH_BREAKER_THRESHOLD', '5'))
+OAUTH_BREAKER_RESET_SECONDS = float(os.environ.get('OAUTH_BREAKER_RESET_SECONDS', '30'))
+
+# Request profiling settings
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN')  # enables the X-Profile request header
+PROFILE_SLOW_MS = float(os.environ.get('PROFILE_SLOW_MS', '500'))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', '20'))
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-# Create the main app without a prefix
-app = FastAPI()
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', '4'))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', '32'))
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -40,6 +399,180 @@ def str_to_objectid(id_str: str):
         raise HTTPException(status_code=400, detail="Invalid ID format")
 
 
+# JSON Responses
+JSON_RESPONSE_BACKEND = os.environ.get('JSON_RESPONSE_BACKEND', 'auto')  # auto, orjson, msgspec, std
+
+
+def json_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def std_json_dumps(content) -> bytes:
+    # Byte-for-byte what starlette's JSONResponse renders
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None,
+        separators=(",", ":"), default=json_default
+    ).encode("utf-8")
+
+
+def select_json_dumps():
+    if JSON_RESPONSE_BACKEND in ("auto", "orjson"):
+        try:
+            import orjson
+            return "orjson", lambda content: orjson.dumps(
+                content, default=json_default, option=orjson.OPT_NON_STR_KEYS
+            )
+        except ImportError:
+            if JSON_RESPONSE_BACKEND == "orjson":
+                raise
+    if JSON_RESPONSE_BACKEND in ("auto", "msgspec"):
+        try:
+            import msgspec
+            return "msgspec", msgspec.json.Encoder(enc_hook=json_default).encode
+        except ImportError:
+            if JSON_RESPONSE_BACKEND == "msgspec":
+                raise
+    return "std", std_json_dumps
+
+
+json_backend, json_dumps = select_json_dumps()
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson or msgspec when installed."""
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return json_dumps(content)
+
+
+# Pagination Helpers
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    try:
+        return json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(sort: list, values: list) -> dict:
+    # (a, b) after (va, vb) => a beyond va, or a == va and b beyond vb
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {f: v for (f, _), v in zip(sort[:i], values[:i])}
+        clause[field] = {"$gt" if direction == ASCENDING else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+async def paginate(collection, query: dict, sort: list, limit: int,
+                   after: Optional[str], response: Response,
+                   projection: Optional[dict] = None) -> list:
+    """Fetch one keyset page of ``query`` ordered by ``sort``.
+
+    ``sort`` must end with ``_id`` so the ordering is total. The cursor for
+    the next page, if any, is returned in the ``X-Next-Cursor`` header.
+    Documents keep their ObjectId ``_id``; see json_page(). A ``projection``
+    must include the sort fields, which the cursor is built from.
+    """
+    if after:
+        values = decode_cursor(after)
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = {"$and": [query, keyset_filter(sort, values)]}
+    
+    cursor = collection.find(query, projection).sort(sort).limit(limit + 1)
+    docs = await cursor.to_list(limit + 1)
+    return finish_page(docs, sort, limit, response)
+
+
+def finish_page(docs: list, sort: list, limit: int, response: Response) -> list:
+    # ``docs`` holds up to limit + 1 results; the extra one only signals a next page
+    if len(docs) > limit:
+        docs = docs[:limit]
+        last = docs[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor([last.get(f) for f, _ in sort])
+    return docs
+
+
+def json_page(docs: list, response: Response) -> Response:
+    # Returning the response directly skips FastAPI's jsonable_encoder pass;
+    # FastJSONResponse encodes ObjectId and datetime values itself
+    return FastJSONResponse(docs, headers=dict(response.headers))
+
+
+# Export Helpers
+EXPORT_BATCH_SIZE = 500
+BOOKING_EXPORT_FIELDS = [
+    "_id", "user_id", "venue_id", "venue_name", "booking_date", "start_time", "end_time",
+    "phone_number", "total_price", "status", "payment_status", "payment_id", "created_at"
+]
+REVIEW_EXPORT_FIELDS = ["_id", "user_id", "venue_id", "rating", "comment", "created_at"]
+
+
+def parse_export_date(value: str) -> datetime:
+    # strptime alone accepts "2026-1-5", which misorders as a stored date string
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        parsed = None
+    if parsed is None or parsed.strftime("%Y-%m-%d") != value:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    return parsed
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+
+async def iter_ndjson(cursor, fields: list):
+    async for doc in cursor:
+        yield json.dumps({f: export_value(doc.get(f)) for f in fields}, default=str) + "\n"
+
+
+async def iter_csv(cursor, fields: list):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for doc in cursor:
+        writer.writerow([export_value(doc.get(f)) for f in fields])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    # Header only, when the cursor was empty
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(cursor, fields: list, export_format: str, filename: str) -> StreamingResponse:
+    """Stream a Motor cursor as NDJSON or CSV without buffering the result set."""
+    if export_format == "csv":
+        body, media_type = iter_csv(cursor, fields), "text/csv"
+    else:
+        body, media_type = iter_ndjson(cursor, fields), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
 # Define Models
 class User(BaseModel):
     user_id: str
@@ -77,9 +610,14 @@ class Venue(BaseModel):
     price_per_hour: float
     images: List[str] = []
     rating: float = 0.0
+    rating_sum: float = 0.0
     total_reviews: int = 0
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    opening_time: str = "06:00"
+    closing_time: str = "23:00"
+    geo: Optional[dict] = None  # GeoJSON point derived from latitude/longitude
+    location_key: Optional[str] = None  # normalized location for prefix search
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class VenueCreate(BaseModel):
@@ -94,6 +632,8 @@ class VenueCreate(BaseModel):
     images: List[str] = []
     latitude: Optional[float] = None
     longitude: Optional[float] = None
+    opening_time: str = "06:00"
+    closing_time: str = "23:00"
 
 class Slot(BaseModel):
     venue_id: str
@@ -109,6 +649,15 @@ class SlotCreate(BaseModel):
     start_time: str
     end_time: str
 
+class SlotRecurrence(BaseModel):
+    venue_id: str
+    start_date: str
+    end_date: str
+    days_of_week: List[int] = Field(default_factory=lambda: list(range(7)))  # 0 = Monday
+    open_time: str
+    close_time: str
+    slot_minutes: int = 60
+
 class Booking(BaseModel):
     user_id: str
     venue_id: str
@@ -118,6 +667,8 @@ class Booking(BaseModel):
     end_time: str
     phone_number: str
     total_price: float
+    total_paise: Optional[int] = None  # absent on bookings made before integer pricing
+    duration_minutes: Optional[int] = None
     status: str = "pending"
     payment_status: str = "pending"
     payment_id: Optional[str] = None
@@ -138,6 +689,26 @@ class Review(BaseModel):
     comment: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class AvailabilityBatchRequest(BaseModel):
+    venue_ids: List[str]
+    start_date: str
+    end_date: str
+
+class BookingStatusUpdate(BaseModel):
+    booking_id: str
+    status: str
+
+class BookingStatusBatch(BaseModel):
+    updates: List[BookingStatusUpdate] = Field(min_length=1, max_length=BOOKING_BULK_MAX_UPDATES)
+
+class PaymentStatusUpdate(BaseModel):
+    booking_id: str
+    payment_status: str
+    payment_id: str
+
+class PaymentStatusBatch(BaseModel):
+    updates: List[PaymentStatusUpdate] = Field(min_length=1, max_length=BOOKING_BULK_MAX_UPDATES)
+
 class ReviewCreate(BaseModel):
     user_id: str
     venue_id: str
@@ -145,8 +716,232 @@ class ReviewCreate(BaseModel):
     comment: str
 
 
+# Caches
+class TTLCache:
+    """Bounded LRU cache with per-entry expiry.
+
+    Entries live for at most ``ttl`` seconds, or less when ``set`` is given an
+    earlier ``expires_at``. Caches are per process, so writes handled by
+    another worker are only picked up here once the entry's TTL runs out.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[object, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= datetime.now(timezone.utc):
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value, expires_at: Optional[datetime] = None):
+        if self.max_size <= 0:
+            return
+        ttl_expiry = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        expires_at = min(expires_at, ttl_expiry) if expires_at else ttl_expiry
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._remove(key)
+
+    def invalidate_where(self, predicate):
+        for key in [k for k in self._entries if predicate(k)]:
+            self._remove(key)
+
+    def clear(self):
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class SearchCache(TTLCache):
+    """Venue search results tagged by the (category, location) they filter on.
+
+    A venue write only drops entries whose filters could match that venue:
+    same or no category, and a location prefix of the venue's location key.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size, ttl)
+        self._tags: dict = {}
+        self._key_tags: dict = {}
+        self.invalidations = 0
+
+    def set(self, key, value, tag: tuple = (None, None)):
+        self._remove(key)
+        super().set(key, value)
+        if key in self._entries:
+            self._tags.setdefault(tag, set()).add(key)
+            self._key_tags[key] = tag
+
+    def _remove(self, key):
+        super()._remove(key)
+        tag = self._key_tags.pop(key, None)
+        if tag is not None:
+            keys = self._tags[tag]
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate_venue(self, categories: List[str], location_key: Optional[str]):
+        for category, location in list(self._tags):
+            if category is not None and category not in categories:
+                continue
+            if location is not None and not (location_key or "").startswith(location):
+                continue
+            for key in list(self._tags.get((category, location), ())):
+                self._remove(key)
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {**super().stats(), "invalidations": self.invalidations}
+
+
+class VenueSnapshot(NamedTuple):
+    """What booking needs from a venue, precomputed in integer units."""
+    name: str
+    price_paise_per_hour: int
+    opening: int  # minutes after midnight
+    closing: int
+    version: int
+
+    def price_paise(self, minutes: int) -> int:
+        # Rounded to the nearest paisa without going through floats
+        return (self.price_paise_per_hour * minutes + 30) // 60
+
+
+class VenueSnapshotCache(TTLCache):
+    """Venue snapshots keyed by venue id.
+
+    Every invalidation bumps ``version``; a load that started before an
+    invalidation is returned to its caller but not cached, so a read racing
+    update_venue cannot put the old pricing back. The version is per process:
+    other workers pick up an edit when their entry's short TTL runs out.
+    """
+
+    PROJECTION = {"name": 1, "price_per_hour": 1, "opening_time": 1, "closing_time": 1}
+
+    def __init__(self, max_size: int, ttl: float):
+        super().__init__(max_size, ttl)
+        self.version = 0
+
+    async def load(self, venue_id: str) -> VenueSnapshot:
+        snapshot = self.get(venue_id)
+        if snapshot is not None:
+            return snapshot
+        version = self.version
+        venue = await db.venues.find_one({"_id": str_to_objectid(venue_id)}, self.PROJECTION)
+        if not venue:
+            raise HTTPException(status_code=404, detail="Venue not found")
+        snapshot = VenueSnapshot(
+            name=venue["name"],
+            price_paise_per_hour=round(venue["price_per_hour"] * 100),
+            opening=time_to_minutes(venue.get("opening_time", "06:00")),
+            closing=time_to_minutes(venue.get("closing_time", "23:00")),
+            version=version,
+        )
+        if self.version == version:
+            self.set(venue_id, snapshot)
+        return snapshot
+
+    def invalidate(self, key):
+        self.version += 1
+        super().invalidate(key)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "version": self.version}
+
+
+session_cache = TTLCache(SESSION_CACHE_SIZE, SESSION_CACHE_TTL)
+search_cache = SearchCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL)
+availability_cache = TTLCache(AVAILABILITY_CACHE_SIZE, AVAILABILITY_CACHE_TTL)
+venue_snapshots = VenueSnapshotCache(VENUE_SNAPSHOT_CACHE_SIZE, VENUE_SNAPSHOT_CACHE_TTL)
+
+
+# Password Hashing Pool
+class PasswordHasher:
+    """Runs bcrypt hash/verify on a bounded thread pool off the event loop.
+
+    At most ``workers`` jobs run at once and up to ``queue_size`` more may
+    wait; beyond that callers get a 429 instead of queueing indefinitely.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.rejected = 0
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many authentication requests, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(pwd_context.verify, password, hashed)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+
 # Authentication Helper
-async def get_current_user(request: Request) -> Optional[User]:
+def get_session_token(request: Request) -> Optional[str]:
     # Check cookie first
     session_token = request.cookies.get("session_token")
     
@@ -156,9 +951,18 @@ async def get_current_user(request: Request) -> Optional[User]:
         if auth_header and auth_header.startswith("Bearer "):
             session_token = auth_header.split(" ")[1]
     
+    return session_token
+
+
+async def get_current_user(request: Request) -> Optional[User]:
+    session_token = get_session_token(request)
     if not session_token:
         return None
     
+    cached_user = session_cache.get(session_token)
+    if cached_user:
+        return cached_user
+    
     # Find session
     session = await db.user_sessions.find_one(
         {"session_token": session_token}, 
@@ -183,10 +987,111 @@ async def get_current_user(request: Request) -> Optional[User]:
     )
     
     if user_doc:
-        return User(**user_doc)
+        user = User(**user_doc)
+        session_cache.set(session_token, user, expires_at)
+        return user
     return None
 
 
+# Outbound HTTP
+class CircuitBreaker:
+    """Fails fast after ``threshold`` consecutive failures.
+
+    While open, calls are rejected for ``reset_seconds``; after that calls are
+    let through again and the first failure re-opens it.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[datetime] = None
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if datetime.now(timezone.utc) - self.opened_at < timedelta(seconds=self.reset_seconds):
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            self.rejected += 1
+            return False
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold or self.state == "half_open":
+            self.opened_at = datetime.now(timezone.utc)
+
+    def stats(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+http_client: Optional[httpx.AsyncClient] = None
+oauth_breaker = CircuitBreaker(OAUTH_BREAKER_THRESHOLD, OAUTH_BREAKER_RESET_SECONDS)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=httpx.Timeout(
+            connect=OAUTH_CONNECT_TIMEOUT,
+            read=OAUTH_READ_TIMEOUT,
+            write=OAUTH_READ_TIMEOUT,
+            pool=OAUTH_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=OAUTH_MAX_CONNECTIONS,
+            max_keepalive_connections=OAUTH_MAX_CONNECTIONS,
+            keepalive_expiry=60
+        )
+    )
+
+
+async def fetch_oauth_session(session_id: str) -> dict:
+    """Exchange an OAuth session ID for user data on the shared client.
+
+    Transport errors and provider failures (429, 5xx or any other unexpected
+    status) are retried with exponential backoff and count against the
+    breaker; a 4xx is raised as 401 for the rejected session ID, and a 503
+    while the provider's circuit is open or once retries are exhausted.
+    """
+    if not oauth_breaker.allow():
+        raise HTTPException(status_code=503, detail="Authentication provider unavailable")
+    
+    for attempt in range(OAUTH_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(0.2 * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+        try:
+            auth_response = await http_client.get(OAUTH_SESSION_URL, headers={"X-Session-ID": session_id})
+        except httpx.TransportError as e:
+            logger.warning("OAuth provider request failed (attempt %d): %s", attempt + 1, e)
+            continue
+        if auth_response.status_code == 200:
+            oauth_breaker.record_success()
+            return auth_response.json()
+        if 400 <= auth_response.status_code < 500 and auth_response.status_code != 429:
+            oauth_breaker.record_success()
+            raise HTTPException(status_code=401, detail="Invalid session ID")
+        logger.warning("OAuth provider returned %d (attempt %d)", auth_response.status_code, attempt + 1)
+    
+    oauth_breaker.record_failure()
+    raise HTTPException(status_code=503, detail="Authentication provider unavailable")
+
+
 # Auth Routes
 @api_router.post("/auth/register")
 async def register(user_data: UserRegister, response: Response):
@@ -196,7 +1101,7 @@ async def register(user_data: UserRegister, response: Response):
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Hash password
-    hashed_password = pwd_context.hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     
     # Create user
     user_id = f"user_{uuid.uuid4().hex[:12]}"
@@ -238,7 +1143,7 @@ async def register(user_data: UserRegister, response: Response):
 async def login(credentials: UserLogin, response: Response):
     # Find user
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not pwd_context.verify(credentials.password, user.get("password", "")):
+    if not user or not await password_hasher.verify(credentials.password, user.get("password", "")):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     # Create session
@@ -268,16 +1173,7 @@ async def login(credentials: UserLogin, response: Response):
 @api_router.post("/auth/google/callback")
 async def google_callback(session_id: str, response: Response):
     # Exchange session_id for session data
-    async with httpx.AsyncClient() as client:
-        auth_response = await client.get(
-            "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
-            headers={"X-Session-ID": session_id}
-        )
-        
-        if auth_response.status_code != 200:
-            raise HTTPException(status_code=401, detail="Invalid session ID")
-        
-        user_data = auth_response.json()
+    user_data = await fetch_oauth_session(session_id)
     
     # Check if user exists
     existing_user = await db.users.find_one({"email": user_data["email"]}, {"_id": 0})
@@ -296,14 +1192,16 @@ async def google_callback(session_id: str, response: Response):
     else:
         user_id = existing_user["user_id"]
     
-    # Create session
+    # Create session; a retried callback for the same session_id refreshes it
     session_token = user_data["session_token"]
-    await db.user_sessions.insert_one({
-        "user_id": user_id,
-        "session_token": session_token,
-        "expires_at": datetime.now(timezone.utc) + timedelta(days=7),
-        "created_at": datetime.now(timezone.utc)
-    })
+    await db.user_sessions.update_one(
+        {"session_token": session_token},
+        {
+            "$set": {"user_id": user_id, "expires_at": datetime.now(timezone.utc) + timedelta(days=7)},
+            "$setOnInsert": {"created_at": datetime.now(timezone.utc)}
+        },
+        upsert=True
+    )
     
     # Set cookie
     response.set_cookie(
@@ -330,8 +1228,9 @@ async def get_me(request: Request):
 
 @api_router.post("/auth/logout")
 async def logout(request: Request, response: Response):
-    session_token = request.cookies.get("session_token")
+    session_token = get_session_token(request)
     if session_token:
+        session_cache.invalidate(session_token)
         await db.user_sessions.delete_one({"session_token": session_token})
     
     response.delete_cookie(key="session_token", path="/")
@@ -339,36 +1238,193 @@ async def logout(request: Request, response: Response):
 
 
 # Venue Routes
+GEO_SEARCH_MAX_RADIUS_KM = 100.0
+
+
+def venue_geo_point(latitude: Optional[float], longitude: Optional[float]) -> Optional[dict]:
+    if latitude is None or longitude is None:
+        return None
+    # GeoJSON orders coordinates as [longitude, latitude]
+    return {"type": "Point", "coordinates": [longitude, latitude]}
+
+
+def normalize_location(location: str) -> str:
+    return location.strip().lower()
+
+
+VENUE_VIEWS = {
+    # Fields the home screen venue card renders
+    "card": ["name", "location", "price_per_hour", "rating", "total_reviews", "categories"],
+    "detail": None,
+}
+VENUE_FIELDS = set(Venue.model_fields)
+
+
+def venue_projection(view: str, fields: Optional[str]) -> Optional[dict]:
+    """Mongo projection for a named view or a comma-separated ``fields`` list.
+
+    ``None`` means the whole document. ``_id`` is always returned.
+    """
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = sorted(set(names) - VENUE_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown venue fields: {', '.join(unknown)}")
+    else:
+        names = VENUE_VIEWS[view]
+    if not names:
+        return None
+    return {name: 1 for name in names}
+
+
+def location_prefix_filter(location: str) -> dict:
+    # Anchored, case-sensitive regex on the normalized key can use the
+    # location_key index; escaping keeps user input from acting as a pattern
+    return {"$regex": "^" + re.escape(normalize_location(location))}
+
+
+async def search_venues_text(query: dict, text: str, limit: int, after: Optional[str],
+                             response: Response, projection: Optional[dict] = None) -> list:
+    sort = [("score", DESCENDING), ("_id", ASCENDING)]
+    pipeline = [
+        {"$match": {**query, "$text": {"$search": text}}},
+        {"$addFields": {"score": {"$meta": "textScore"}}}
+    ]
+    if after:
+        values = decode_cursor(after)
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        pipeline.append({"$match": keyset_filter(sort, values)})
+    pipeline += [{"$sort": dict(sort)}, {"$limit": limit + 1}]
+    if projection:
+        # Keep the computed sort key; the next-page cursor is built from it
+        pipeline.append({"$project": {**projection, sort[0][0]: 1}})
+    
+    docs = await db.venues.aggregate(pipeline).to_list(limit + 1)
+    return finish_page(docs, sort, limit, response)
+
+
+async def search_venues_near(query: dict, lat: float, lng: float, radius_km: float,
+                             limit: int, after: Optional[str], response: Response,
+                             projection: Optional[dict] = None) -> list:
+    sort = [("distance_km", ASCENDING), ("_id", ASCENDING)]
+    geo_near = {
+        "near": {"type": "Point", "coordinates": [lng, lat]},
+        "distanceField": "distance_km",
+        "distanceMultiplier": 0.001,
+        "maxDistance": radius_km * 1000,
+        "spherical": True,
+        "query": query
+    }
+    pipeline = [{"$geoNear": geo_near}]
+    if after:
+        values = decode_cursor(after)
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # minDistance prunes earlier pages (with 1m slack for float rounding);
+        # the keyset match then resolves ties at the boundary distance
+        geo_near["minDistance"] = max(0.0, values[0] * 1000 - 1)
+        pipeline.append({"$match": keyset_filter(sort, values)})
+    pipeline += [{"$sort": dict(sort)}, {"$limit": limit + 1}]
+    if projection:
+        # Keep the computed sort key; the next-page cursor is built from it
+        pipeline.append({"$project": {**projection, sort[0][0]: 1}})
+    
+    docs = await db.venues.aggregate(pipeline).to_list(limit + 1)
+    return finish_page(docs, sort, limit, response)
+
+
+def opening_hours(venue: VenueCreate) -> tuple:
+    # Availability and pricing parse these on every read, so bad hours are
+    # rejected when written; returns them normalized to HH:MM
+    try:
+        opening, closing = time_to_minutes(venue.opening_time), time_to_minutes(venue.closing_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if closing <= opening:
+        raise HTTPException(status_code=400, detail="closing_time must be after opening_time")
+    return minutes_to_time(opening), minutes_to_time(closing)
+
+
 @api_router.post("/venues", status_code=201)
 async def create_venue(venue: VenueCreate):
     venue_dict = venue.dict()
+    venue_dict['opening_time'], venue_dict['closing_time'] = opening_hours(venue)
+    venue_dict['location_key'] = normalize_location(venue.location)
+    geo = venue_geo_point(venue.latitude, venue.longitude)
+    if geo:
+        venue_dict['geo'] = geo
     venue_dict['created_at'] = datetime.now(timezone.utc)
     venue_dict['rating'] = 0.0
+    venue_dict['rating_sum'] = 0.0
     venue_dict['total_reviews'] = 0
     result = await db.venues.insert_one(venue_dict)
+    search_cache.invalidate_venue(venue.categories, venue_dict['location_key'])
     venue_dict['_id'] = str(result.inserted_id)
     return venue_dict
 
 @api_router.get("/venues/search")
 async def search_venues(
+    response: Response,
     category: Optional[str] = None,
     location: Optional[str] = None,
-    search_date: Optional[str] = None
+    search_date: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    radius_km: float = Query(10.0, gt=0, le=GEO_SEARCH_MAX_RADIUS_KM),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    view: Literal["card", "detail"] = "detail",
+    fields: Optional[str] = Query(None, description="Comma-separated venue fields; overrides view")
 ):
+    projection = venue_projection(view, fields)
     query = {}
     if category:
         query['categories'] = category
     if location:
-        query['location'] = {"$regex": location, "$options": "i"}
+        query['location_key'] = location_prefix_filter(location)
     
-    venues = await db.venues.find(query).to_list(100)
-    for venue in venues:
-        venue['_id'] = str(venue['_id'])
-    return venues
+    if (lat is None) != (lng is None):
+        raise HTTPException(status_code=400, detail="lat and lng must be provided together")
+    if lat is not None and q:
+        raise HTTPException(status_code=400, detail="Text search cannot be combined with lat/lng")
+    
+    location_key = normalize_location(location) if location else None
+    projection_key = tuple(projection) if projection else None
+    cache_key = (
+        category, location_key, search_date, q, lat, lng, radius_km, limit, after, projection_key
+    )
+    cached = search_cache.get(cache_key)
+    if cached is not None:
+        venues, next_cursor = cached
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return json_page(venues, response)
+    
+    if lat is not None:
+        venues = await search_venues_near(
+            query, lat, lng, radius_km, limit, after, response, projection
+        )
+    elif q:
+        venues = await search_venues_text(query, q, limit, after, response, projection)
+    else:
+        venues = await paginate(
+            db.venues, query, [("_id", ASCENDING)], limit, after, response, projection
+        )
+    
+    search_cache.set(
+        cache_key,
+        (venues, response.headers.get("X-Next-Cursor")),
+        tag=(category, location_key)
+    )
+    return json_page(venues, response)
 
 @api_router.get("/venues/{venue_id}")
-async def get_venue(venue_id: str):
-    venue = await db.venues.find_one({"_id": str_to_objectid(venue_id)})
+async def get_venue(venue_id: str, fields: Optional[str] = None):
+    venue = await db.venues.find_one(
+        {"_id": str_to_objectid(venue_id)}, venue_projection("detail", fields)
+    )
     if not venue:
         raise HTTPException(status_code=404, detail="Venue not found")
     venue['_id'] = str(venue['_id'])
@@ -376,149 +1432,1832 @@ async def get_venue(venue_id: str):
 
 @api_router.put("/venues/{venue_id}")
 async def update_venue(venue_id: str, venue: VenueCreate):
-    result = await db.venues.update_one(
+    venue_dict = venue.dict()
+    venue_dict['opening_time'], venue_dict['closing_time'] = opening_hours(venue)
+    venue_dict['location_key'] = normalize_location(venue.location)
+    geo = venue_geo_point(venue.latitude, venue.longitude)
+    update = {"$set": {**venue_dict, "geo": geo}} if geo else {
+        "$set": venue_dict, "$unset": {"geo": ""}
+    }
+    previous = await db.venues.find_one_and_update(
         {"_id": str_to_objectid(venue_id)},
-        {"$set": venue.dict()}
+        update,
+        projection={"categories": 1, "location_key": 1}
     )
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(status_code=404, detail="Venue not found")
+    # Results that matched the venue before or after the edit are both stale
+    search_cache.invalidate_venue(previous.get("categories", []), previous.get("location_key"))
+    search_cache.invalidate_venue(venue.categories, venue_dict['location_key'])
+    # Opening hours and pricing may have changed
+    availability_cache.invalidate_where(lambda key: key[0] == venue_id)
+    venue_snapshots.invalidate(venue_id)
     return {"message": "Venue updated successfully"}
 
 @api_router.get("/venues/owner/{owner_id}")
-async def get_owner_venues(owner_id: str):
-    venues = await db.venues.find({"owner_id": owner_id}).to_list(100)
-    for venue in venues:
-        venue['_id'] = str(venue['_id'])
-    return venues
+async def get_owner_venues(
+    owner_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None,
+    view: Literal["card", "detail"] = "detail",
+    fields: Optional[str] = None
+):
+    docs = await paginate(
+        db.venues, {"owner_id": owner_id}, [("_id", ASCENDING)], limit, after, response,
+        venue_projection(view, fields)
+    )
+    return json_page(docs, response)
 
 
-# Slot Routes
-@api_router.post("/slots", status_code=201)
-async def create_slot(slot: SlotCreate):
-    slot_dict = slot.dict()
-    slot_dict['status'] = 'available'
-    slot_dict['created_at'] = datetime.now(timezone.utc)
-    result = await db.slots.insert_one(slot_dict)
-    slot_dict['_id'] = str(result.inserted_id)
-    return slot_dict
+# Availability Engine
+MINUTES_PER_DAY = 24 * 60
+BUSY_SLOT_STATUSES = ["held", "booked", "blocked"]
 
-@api_router.get("/slots/available/{venue_id}")
-async def get_available_slots(venue_id: str, search_date: str):
-    slots = await db.slots.find({
-        "venue_id": venue_id,
-        "booking_date": search_date,
-        "status": "available"
-    }).to_list(100)
-    for slot in slots:
-        slot['_id'] = str(slot['_id'])
-    return slots
 
-@api_router.put("/slots/{slot_id}/status")
-async def update_slot_status(slot_id: str, status: str):
-    result = await db.slots.update_one(
-        {"_id": str_to_objectid(slot_id)},
-        {"$set": {"status": status}}
-    )
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Slot not found")
-    return {"message": "Slot status updated"}
+def time_to_minutes(value: str) -> int:
+    """Parse ``HH:MM`` into minutes after midnight; ``24:00`` means end of day."""
+    try:
+        hours, minutes = value.split(":")
+        total = int(hours) * 60 + int(minutes)
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid time {value!r}, expected HH:MM")
+    if not 0 <= int(minutes) < 60 or not 0 <= total <= MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time {value!r}, expected HH:MM")
+    return total
+
+
+def minutes_to_time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def interval_minutes(start_time: str, end_time: str) -> tuple:
+    """Validate a requested [start, end) interval on one day, in minutes.
+
+    ``00:00`` as an end means midnight. Anything else ending at or before
+    its start is rejected rather than cut off, since bookings and slots
+    cannot run into the next day.
+    """
+    start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+    if end == 0:
+        end = MINUTES_PER_DAY
+    if end <= start:
+        raise ValueError("end_time must be after start_time (use 24:00 for midnight)")
+    return start, end
+
+
+def stored_interval_minutes(start_time: str, end_time: str) -> tuple:
+    # Documents written before end times were validated may wrap past
+    # midnight; only the part on their own date is busy
+    start, end = time_to_minutes(start_time), time_to_minutes(end_time)
+    if end <= start:
+        end = MINUTES_PER_DAY
+    return start, end
+
+
+class DayAvailability:
+    """Free time of one venue on one day.
+
+    Busy intervals are merged and complemented within opening hours into
+    sorted, disjoint [start, end) windows in minutes, so lookups bisect to the
+    first relevant window and only walk the k windows they return.
+    """
+
+    def __init__(self, opening: int, closing: int, busy: List[tuple]):
+        self.opening = opening
+        self.closing = closing
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        cursor = opening
+        for start, end in sorted(busy):
+            if start > cursor:
+                self._add(cursor, min(start, closing))
+            cursor = max(cursor, end)
+        self._add(cursor, closing)
+
+    def _add(self, start: int, end: int):
+        if end > start:
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def is_free(self, start: int, end: int) -> bool:
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and self.ends[i] >= end
+
+    def free_windows(self, duration: int = 1, start: Optional[int] = None,
+                     end: Optional[int] = None) -> List[tuple]:
+        start = self.opening if start is None else start
+        end = self.closing if end is None else end
+        windows = []
+        i = bisect_right(self.ends, start)
+        while i < len(self.starts) and self.starts[i] < end:
+            window = (max(self.starts[i], start), min(self.ends[i], end))
+            if window[1] - window[0] >= duration:
+                windows.append(window)
+            i += 1
+        return windows
+
+    def slots(self, duration: int, step: int) -> List[tuple]:
+        # Bookable starts are aligned to opening time + k * step
+        slots = []
+        for window_start, window_end in self.free_windows(duration):
+            offset = (window_start - self.opening) % step
+            start = window_start + (step - offset if offset else 0)
+            while start + duration <= window_end:
+                slots.append((start, start + duration))
+                start += step
+        return slots
+
+
+async def load_day_availability(venue_id: str, booking_date: str,
+                                venue: Optional[VenueSnapshot] = None) -> DayAvailability:
+    """Build (or fetch from cache) a venue's availability for one date.
+
+    Busy time comes from held, booked and blocked slots plus confirmed
+    bookings, which covers bookings made before slots were tracked.
+    """
+    cache_key = (venue_id, booking_date)
+    cached = availability_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    day_query = {"venue_id": venue_id, "booking_date": booking_date}
+    slots_query = db.slots.find(
+        {**day_query, "status": {"$in": BUSY_SLOT_STATUSES}},
+        {"start_time": 1, "end_time": 1, "booking_end_time": 1, "status": 1, "held_until": 1}
+    ).to_list(None)
+    bookings_query = db.bookings.find(
+        {**day_query, "status": "confirmed"}, {"start_time": 1, "end_time": 1}
+    ).to_list(None)
+    if venue is None:
+        venue, slots, bookings = await asyncio.gather(
+            venue_snapshots.load(venue_id), slots_query, bookings_query
+        )
+    else:
+        slots, bookings = await asyncio.gather(slots_query, bookings_query)
+    
+    now = datetime.now(timezone.utc)
+    busy = []
+    for slot in slots:
+        held_until = slot.get("held_until")
+        if slot["status"] == "held" and held_until:
+            if held_until.tzinfo is None:
+                held_until = held_until.replace(tzinfo=timezone.utc)
+            if held_until <= now:
+                continue
+        busy.append(slot_busy_interval(slot))
+    for booking in bookings:
+        busy.append(stored_interval_minutes(booking["start_time"], booking["end_time"]))
+    
+    availability = DayAvailability(venue.opening, venue.closing, busy)
+    availability_cache.set(cache_key, availability)
+    return availability
+
+
+def hour_bitmap(availability: DayAvailability) -> int:
+    # Bit h is set when the hour starting at h:00 is entirely free
+    bitmap = 0
+    for hour in range(24):
+        if availability.is_free(hour * 60, hour * 60 + 60):
+            bitmap |= 1 << hour
+    return bitmap
+
+
+def busy_intervals_pipeline(venue_ids: List[str], start_date: str, end_date: str) -> list:
+    """Busy intervals of many venue-days from slots and bookings in one pipeline."""
+    day_match = {
+        "venue_id": {"$in": venue_ids},
+        "booking_date": {"$gte": start_date, "$lte": end_date}
+    }
+    project = {"_id": 0, "venue_id": 1, "booking_date": 1, "start_time": 1, "end_time": 1}
+    return [
+        {"$match": {**day_match, "$or": [
+            {"status": {"$in": ["booked", "blocked"]}},
+            {"status": "held", "held_until": {"$gt": datetime.now(timezone.utc)}}
+        ]}},
+        # A claimed slot is busy for the whole booking, not just its own length
+        {"$project": {**project, "end_time": {"$ifNull": ["$booking_end_time", "$end_time"]}}},
+        {"$unionWith": {"coll": "bookings", "pipeline": [
+            {"$match": {**day_match, "status": "confirmed"}},
+            {"$project": project}
+        ]}},
+        {"$group": {
+            "_id": {"venue_id": "$venue_id", "booking_date": "$booking_date"},
+            "busy": {"$push": {"start_time": "$start_time", "end_time": "$end_time"}}
+        }}
+    ]
+
+
+def invalidate_availability(venue_id: str, booking_date: str):
+    availability_cache.invalidate((venue_id, booking_date))
+    # Live subscribers hear about this worker's own writes without waiting
+    # for the change stream or the next poll
+    availability_hub.refresh_later(venue_id, booking_date)
+
+
+# Slot Reservation
+# A slot is identified by (venue_id, booking_date, start_time) and moves
+# available -> held (pending payment) -> booked, or back to available when the
+# booking is cancelled or its hold expires. A booking claims the slot at its
+# start time, upserting it if the venue has no pre-generated slots, plus every
+# slot starting inside its interval, and records its end as booking_end_time.
+# Upserted slots are marked created_by_hold and deleted again on release, so
+# they never show up as owner-opened time.
+# The unique index turns two claims on one start time into a DuplicateKeyError;
+# claims that overlap without sharing a start time are caught by re-reading
+# the day after claiming, so no global lock is needed.
+OWNER_SLOT_STATUSES = ["available", "blocked"]
+SLOT_CLAIM_RELEASE = {
+    "$set": {"status": "available"},
+    "$unset": {"booking_id": "", "held_until": "", "held_at": "", "booking_end_time": ""}
+}
+
+
+def as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def claimable_slot_filter(venue_id: str, booking_date: str, booking_id: str) -> dict:
+    # Free, held under a lapsed hold, or already this booking's
+    return {
+        "venue_id": venue_id,
+        "booking_date": booking_date,
+        "$or": [
+            {"status": "available"},
+            {"status": "held", "held_until": {"$lte": datetime.now(timezone.utc)}},
+            {"booking_id": booking_id}
+        ]
+    }
+
+
+def slot_busy_interval(slot: dict) -> tuple:
+    return stored_interval_minutes(slot["start_time"], slot.get("booking_end_time") or slot["end_time"])
+
+
+async def claim_interval(venue_id: str, booking_date: str, start_time: str, end_time: str,
+                         booking_id: str, status: str = "held",
+                         held_at: Optional[datetime] = None) -> bool:
+    """Claim every slot in [start_time, end_time) for ``booking_id``.
+
+    ``status`` is "held" for a new booking and "booked" on confirmation.
+    Returns False, leaving none of the booking's slots claimed, if any part
+    of the interval is booked, blocked or held by another booking. Two holds
+    racing for overlapping time both see each other on the re-read; the one
+    claimed first (by ``held_at``, then booking id) keeps the time.
+    """
+    start, end = interval_minutes(start_time, end_time)
+    start_key, end_key = minutes_to_time(start), minutes_to_time(end)
+    now = datetime.now(timezone.utc)
+    held_at = held_at or now
+    claim = {"status": status, "booking_id": booking_id, "held_at": held_at, "booking_end_time": end_key}
+    update = {"$set": claim}
+    if status == "held":
+        claim["held_until"] = now + timedelta(minutes=SLOT_HOLD_MINUTES)
+    else:
+        update["$unset"] = {"held_until": ""}
+    
+    claimable = claimable_slot_filter(venue_id, booking_date, booking_id)
+    try:
+        await db.slots.update_one(
+            {**claimable, "start_time": start_key},
+            {**update, "$setOnInsert": {"end_time": end_key, "created_by_hold": True, "created_at": now}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # A confirmation may still hold slots inside the interval
+        await release_booking_slots(venue_id, booking_date, booking_id)
+        return False
+    await db.slots.update_many({**claimable, "start_time": {"$gt": start_key, "$lt": end_key}}, update)
+    
+    others = await db.slots.find(
+        {
+            "venue_id": venue_id,
+            "booking_date": booking_date,
+            "start_time": {"$lt": end_key},
+            "status": {"$in": BUSY_SLOT_STATUSES},
+            "booking_id": {"$ne": booking_id}
+        },
+        {"start_time": 1, "end_time": 1, "booking_end_time": 1, "status": 1,
+         "booking_id": 1, "held_until": 1, "held_at": 1}
+    ).to_list(None)
+    for slot in others:
+        other_start, other_end = slot_busy_interval(slot)
+        if other_end <= start or other_start >= end:
+            continue
+        if slot["status"] == "held":
+            if as_utc(slot["held_until"]) <= now:
+                continue
+            # Legacy holds without held_at predate every new claim
+            other_key = (as_utc(slot.get("held_at") or datetime.min), slot.get("booking_id", ""))
+            if other_key > (as_utc(held_at), booking_id):
+                continue  # the later claim backs off when it re-reads ours
+        await release_booking_slots(venue_id, booking_date, booking_id)
+        return False
+    return True
+
+
+async def claim_slot(venue_id: str, booking_date: str, start_time: str,
+                     end_time: str, booking_id: str) -> bool:
+    return await claim_interval(venue_id, booking_date, start_time, end_time, booking_id)
+
+
+async def confirm_slot(booking: dict) -> bool:
+    """Book the booking's interval; False if another booking has taken part of it.
+
+    A hold that is still valid keeps its original claim time, so it wins
+    against holds placed while it was valid. A lapsed hold re-claims as of
+    now and loses to anyone who legitimately claimed the time meanwhile.
+    """
+    booking_id = str(booking['_id'])
+    own = await db.slots.find_one(
+        {"venue_id": booking['venue_id'], "booking_date": booking['booking_date'], "booking_id": booking_id},
+        {"status": 1, "held_until": 1, "held_at": 1}
+    )
+    held_at = None
+    if own and own.get("held_at"):
+        if own["status"] == "booked" or as_utc(own["held_until"]) > datetime.now(timezone.utc):
+            held_at = as_utc(own["held_at"])
+    return await claim_interval(
+        booking['venue_id'], booking['booking_date'], booking['start_time'], booking['end_time'],
+        booking_id, status="booked", held_at=held_at
+    )
+
+
+def release_slot_writes(venue_id: str, booking_date: str, booking_id: str) -> list:
+    # Slots the hold created go away; owner-created ones become available again
+    query = {"venue_id": venue_id, "booking_date": booking_date, "booking_id": booking_id}
+    return [DeleteMany({**query, "created_by_hold": True}), UpdateMany(query, SLOT_CLAIM_RELEASE)]
+
+
+async def release_booking_slots(venue_id: str, booking_date: str, booking_id: str):
+    await db.slots.bulk_write(release_slot_writes(venue_id, booking_date, booking_id), ordered=False)
+
+
+async def release_slot(booking: dict):
+    await release_booking_slots(booking['venue_id'], booking['booking_date'], str(booking['_id']))
+
+
+async def release_expired_holds() -> int:
+    lapsed = {"status": "held", "held_until": {"$lte": datetime.now(timezone.utc)}}
+    deleted = await db.slots.delete_many({**lapsed, "created_by_hold": True})
+    result = await db.slots.update_many(lapsed, SLOT_CLAIM_RELEASE)
+    return deleted.deleted_count + result.modified_count
+
+
+# Slot Routes
+@api_router.post("/slots", status_code=201)
+async def create_slot(slot: SlotCreate):
+    try:
+        interval_minutes(slot.start_time, slot.end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    slot_dict = slot.dict()
+    slot_dict['status'] = 'available'
+    slot_dict['created_at'] = datetime.now(timezone.utc)
+    try:
+        result = await db.slots.insert_one(slot_dict)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Slot already exists")
+    invalidate_availability(slot.venue_id, slot.booking_date)
+    slot_dict['_id'] = str(result.inserted_id)
+    return slot_dict
+
+@api_router.post("/slots/bulk", status_code=201)
+async def create_slots_bulk(recurrence: SlotRecurrence):
+    """Expand a weekly recurrence into slots and insert the ones that don't exist yet."""
+    try:
+        first = datetime.strptime(recurrence.start_date, "%Y-%m-%d")
+        last = datetime.strptime(recurrence.end_date, "%Y-%m-%d")
+        opening = time_to_minutes(recurrence.open_time)
+        closing = time_to_minutes(recurrence.close_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    days = (last - first).days + 1
+    if not 0 < days <= SLOT_BULK_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range must cover between 1 and {SLOT_BULK_MAX_DAYS} days"
+        )
+    if not 15 <= recurrence.slot_minutes <= closing - opening:
+        raise HTTPException(status_code=400, detail="slot_minutes must fit between open_time and close_time")
+    if any(day not in range(7) for day in recurrence.days_of_week):
+        raise HTTPException(status_code=400, detail="days_of_week must be 0 (Monday) to 6 (Sunday)")
+    if not await db.venues.count_documents({"_id": str_to_objectid(recurrence.venue_id)}, limit=1):
+        raise HTTPException(status_code=404, detail="Venue not found")
+    
+    starts = range(opening, closing - recurrence.slot_minutes + 1, recurrence.slot_minutes)
+    dates = [
+        day.strftime("%Y-%m-%d")
+        for day in (first + timedelta(days=i) for i in range(days))
+        if day.weekday() in recurrence.days_of_week
+    ]
+    if len(dates) * len(starts) > SLOT_BULK_MAX_SLOTS:
+        raise HTTPException(status_code=400, detail=f"Recurrence expands to more than {SLOT_BULK_MAX_SLOTS} slots")
+    
+    now = datetime.now(timezone.utc)
+    slots = [
+        {
+            "venue_id": recurrence.venue_id,
+            "booking_date": booking_date,
+            "start_time": minutes_to_time(start),
+            "end_time": minutes_to_time(start + recurrence.slot_minutes),
+            "status": "available",
+            "created_at": now
+        }
+        for booking_date in dates
+        for start in starts
+    ]
+    
+    # Unordered inserts keep going past duplicates, which the unique
+    # (venue_id, booking_date, start_time) index rejects individually
+    inserted = duplicates = 0
+    for i in range(0, len(slots), SLOT_BULK_BATCH_SIZE):
+        batch = slots[i:i + SLOT_BULK_BATCH_SIZE]
+        try:
+            result = await db.slots.insert_many(batch, ordered=False)
+            inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            inserted += e.details["nInserted"]
+            errors = e.details["writeErrors"]
+            duplicates += sum(1 for error in errors if error["code"] == 11000)
+            if any(error["code"] != 11000 for error in errors):
+                raise
+    
+    # Slots a booking created by holding time the owner had not opened yet
+    # become grid slots, so releasing the booking no longer deletes them
+    grid_ends = {minutes_to_time(start): minutes_to_time(start + recurrence.slot_minutes) for start in starts}
+    adopted = await db.slots.find(
+        {
+            "venue_id": recurrence.venue_id,
+            "booking_date": {"$in": dates},
+            "start_time": {"$in": list(grid_ends)},
+            "created_by_hold": True
+        },
+        {"start_time": 1}
+    ).to_list(None)
+    if adopted:
+        await db.slots.bulk_write([
+            UpdateOne(
+                {"_id": slot["_id"], "created_by_hold": True},
+                {"$set": {"end_time": grid_ends[slot["start_time"]]}, "$unset": {"created_by_hold": ""}}
+            )
+            for slot in adopted
+        ], ordered=False)
+    
+    generated_dates = set(dates)
+    availability_cache.invalidate_where(
+        lambda key: key[0] == recurrence.venue_id and key[1] in generated_dates
+    )
+    return {
+        "venue_id": recurrence.venue_id,
+        "requested": len(slots),
+        "inserted": inserted,
+        "skipped_duplicates": duplicates
+    }
+
+@api_router.get("/slots/available/{venue_id}")
+async def get_available_slots(
+    venue_id: str,
+    search_date: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    docs = await paginate(
+        db.slots,
+        {"venue_id": venue_id, "booking_date": search_date, "status": "available"},
+        [("start_time", ASCENDING), ("_id", ASCENDING)],
+        limit, after, response
+    )
+    return json_page(docs, response)
+
+def availability_payload(venue_id: str, search_date: str, availability: DayAvailability,
+                         duration: int = 60, step: int = 60) -> dict:
+    return {
+        "venue_id": venue_id,
+        "date": search_date,
+        "opening_time": minutes_to_time(availability.opening),
+        "closing_time": minutes_to_time(availability.closing),
+        "free_windows": [
+            {"start_time": minutes_to_time(start), "end_time": minutes_to_time(end)}
+            for start, end in availability.free_windows(duration)
+        ],
+        "slots": [
+            {"start_time": minutes_to_time(start), "end_time": minutes_to_time(end)}
+            for start, end in availability.slots(duration, step)
+        ]
+    }
+
+
+@api_router.get("/availability/{venue_id}")
+async def get_availability(
+    venue_id: str,
+    search_date: str,
+    duration: int = Query(60, ge=15, le=MINUTES_PER_DAY),
+    step: int = Query(60, ge=15, le=MINUTES_PER_DAY)
+):
+    availability = await load_day_availability(venue_id, search_date)
+    return availability_payload(venue_id, search_date, availability, duration, step)
+
+@api_router.post("/availability/batch")
+async def get_availability_batch(batch: AvailabilityBatchRequest):
+    """Hourly availability bitmaps for many venues over a date range.
+
+    ``venues[venue_id][i]`` is the bitmap for ``dates[i]``; bit h set means
+    the hour starting at h:00 is free.
+    """
+    venue_ids = list(dict.fromkeys(batch.venue_ids))
+    if not 0 < len(venue_ids) <= AVAILABILITY_BATCH_MAX_VENUES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 1 and {AVAILABILITY_BATCH_MAX_VENUES} venue IDs"
+        )
+    try:
+        first = datetime.strptime(batch.start_date, "%Y-%m-%d")
+        last = datetime.strptime(batch.end_date, "%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Dates must be in YYYY-MM-DD format")
+    days = (last - first).days + 1
+    if not 0 < days <= AVAILABILITY_BATCH_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range must cover between 1 and {AVAILABILITY_BATCH_MAX_DAYS} days"
+        )
+    dates = [(first + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
+    
+    venues, groups = await asyncio.gather(
+        db.venues.find(
+            {"_id": {"$in": [str_to_objectid(venue_id) for venue_id in venue_ids]}},
+            {"opening_time": 1, "closing_time": 1}
+        ).to_list(None),
+        db.slots.aggregate(
+            busy_intervals_pipeline(venue_ids, batch.start_date, batch.end_date)
+        ).to_list(None)
+    )
+    busy_by_day = {
+        (group["_id"]["venue_id"], group["_id"]["booking_date"]): [
+            stored_interval_minutes(interval["start_time"], interval["end_time"])
+            for interval in group["busy"]
+        ]
+        for group in groups
+    }
+    
+    result = {}
+    for venue in venues:
+        venue_id = str(venue["_id"])
+        opening = time_to_minutes(venue.get("opening_time", "06:00"))
+        closing = time_to_minutes(venue.get("closing_time", "23:00"))
+        bitmaps = []
+        for booking_date in dates:
+            availability = DayAvailability(opening, closing, busy_by_day.get((venue_id, booking_date), []))
+            availability_cache.set((venue_id, booking_date), availability)
+            bitmaps.append(hour_bitmap(availability))
+        result[venue_id] = bitmaps
+    
+    return {
+        "dates": dates,
+        "venues": result,
+        "missing": [venue_id for venue_id in venue_ids if venue_id not in result]
+    }
+
+@api_router.put("/slots/{slot_id}/status")
+async def update_slot_status(slot_id: str, status: str = Query(..., pattern="^(available|blocked)$")):
+    # Owners may open or block a slot, but never take over a held or booked one
+    slot_oid = str_to_objectid(slot_id)
+    slot = await db.slots.find_one_and_update(
+        {"_id": slot_oid, "status": {"$in": OWNER_SLOT_STATUSES}},
+        {"$set": {"status": status}},
+        projection={"venue_id": 1, "booking_date": 1}
+    )
+    if slot is None:
+        if await db.slots.count_documents({"_id": slot_oid}, limit=1) == 0:
+            raise HTTPException(status_code=404, detail="Slot not found")
+        raise HTTPException(status_code=409, detail="Slot is held or booked")
+    invalidate_availability(slot['venue_id'], slot['booking_date'])
+    return {"message": "Slot status updated"}
+
+
+# Live Availability Feed
+class AvailabilityHub:
+    """Fans availability changes for a venue/date out to SSE subscribers.
+
+    Each venue with subscribers gets a single watcher task, however many
+    clients follow it. The watcher follows a change stream over ``bookings``
+    and ``slots`` filtered to the venue; on a standalone mongod, where change
+    streams are unavailable, it polls the subscribed dates instead. A change
+    is recomputed once per (venue, date) and pushed to every subscriber of
+    that date, and only when the payload differs from the last one sent.
+    """
+
+    def __init__(self, poll_seconds: float, max_subscribers: int, queue_size: int):
+        self.poll_seconds = poll_seconds
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self.change_streams: Optional[bool] = None  # unknown until a watcher has tried
+        self._subscribers: dict = {}  # venue_id -> {date: set of queues}
+        self._watchers: dict = {}  # venue_id -> asyncio.Task
+        self._last: dict = {}  # (venue_id, date) -> last payload sent
+        self._refreshing: set = set()
+        self._dirty: set = set()
+        self._tasks: set = set()
+        self.events_sent = 0
+        self.refreshes = 0
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for dates in self._subscribers.values() for queues in dates.values())
+
+    async def subscribe(self, venue_id: str, booking_date: str) -> tuple:
+        """Register a subscriber; returns its queue and the current payload."""
+        self.check_capacity()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(venue_id, {}).setdefault(booking_date, set()).add(queue)
+        if venue_id not in self._watchers:
+            self._watchers[venue_id] = asyncio.create_task(self._watch(venue_id))
+        try:
+            availability = await load_day_availability(venue_id, booking_date)
+        except BaseException:
+            self.unsubscribe(venue_id, booking_date, queue)
+            raise
+        payload = availability_payload(venue_id, booking_date, availability)
+        # Existing subscribers may hold an older state; a pending refresh
+        # compares against what they were sent
+        self._last.setdefault((venue_id, booking_date), payload)
+        return queue, payload
+
+    def check_capacity(self):
+        if self.subscriber_count() >= self.max_subscribers:
+            raise HTTPException(status_code=503, detail="Too many live availability subscribers")
+
+    def unsubscribe(self, venue_id: str, booking_date: str, queue: asyncio.Queue):
+        dates = self._subscribers.get(venue_id, {})
+        queues = dates.get(booking_date, set())
+        queues.discard(queue)
+        if not queues:
+            dates.pop(booking_date, None)
+            self._last.pop((venue_id, booking_date), None)
+        if not dates:
+            self._subscribers.pop(venue_id, None)
+            watcher = self._watchers.pop(venue_id, None)
+            if watcher:
+                watcher.cancel()
+
+    def refresh_later(self, venue_id: str, booking_date: str):
+        if booking_date not in self._subscribers.get(venue_id, {}):
+            return
+        task = asyncio.create_task(self.refresh(venue_id, booking_date))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def refresh(self, venue_id: str, booking_date: str):
+        # Changes arriving while a refresh runs are folded into one more pass,
+        # so subscribers never receive an older state after a newer one
+        key = (venue_id, booking_date)
+        if key in self._refreshing:
+            self._dirty.add(key)
+            return
+        self._refreshing.add(key)
+        try:
+            while True:
+                self._dirty.discard(key)
+                await self._publish(venue_id, booking_date)
+                if key not in self._dirty:
+                    break
+        except Exception:
+            logger.exception("Refreshing live availability for %s on %s failed", venue_id, booking_date)
+        finally:
+            self._refreshing.discard(key)
+
+    async def _publish(self, venue_id: str, booking_date: str):
+        queues = self._subscribers.get(venue_id, {}).get(booking_date)
+        if not queues:
+            return
+        self.refreshes += 1
+        # The cached entry may predate a write made by another worker
+        availability_cache.invalidate((venue_id, booking_date))
+        availability = await load_day_availability(venue_id, booking_date)
+        payload = availability_payload(venue_id, booking_date, availability)
+        key = (venue_id, booking_date)
+        if self._last.get(key) == payload:
+            return
+        self._last[key] = payload
+        for queue in list(queues):
+            if queue.full():
+                # A slow client only needs the latest state
+                queue.get_nowait()
+            queue.put_nowait(payload)
+            self.events_sent += 1
+
+    async def _watch(self, venue_id: str):
+        while True:
+            try:
+                if self.change_streams is False:
+                    await self._poll(venue_id)
+                else:
+                    await self._follow_changes(venue_id)
+            except OperationFailure as e:
+                if e.code != 40573:  # not a replica set, so no change streams
+                    logger.exception("Live availability watcher for venue %s failed", venue_id)
+                elif self.change_streams is not False:
+                    self.change_streams = False
+                    logger.info("Change streams unavailable; polling live availability every %ss",
+                                self.poll_seconds)
+                    continue
+            except Exception:
+                logger.exception("Live availability watcher for venue %s failed", venue_id)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _follow_changes(self, venue_id: str):
+        pipeline = [{"$match": {
+            "ns.coll": {"$in": ["bookings", "slots"]},
+            "fullDocument.venue_id": venue_id,
+        }}]
+        async with db.watch(pipeline, full_document="updateLookup") as stream:
+            self.change_streams = True
+            # Catch up on anything missed before the stream opened or between restarts
+            for booking_date in list(self._subscribers.get(venue_id, {})):
+                self.refresh_later(venue_id, booking_date)
+            async for change in stream:
+                self.refresh_later(venue_id, change["fullDocument"]["booking_date"])
+
+    async def _poll(self, venue_id: str):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            for booking_date in list(self._subscribers.get(venue_id, {})):
+                await self.refresh(venue_id, booking_date)
+
+    async def stop(self):
+        tasks = [*self._watchers.values(), *self._tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._watchers.clear()
+
+    def stats(self) -> dict:
+        if self.change_streams is None:
+            mode = "idle"
+        else:
+            mode = "change_stream" if self.change_streams else "polling"
+        return {
+            "mode": mode,
+            "venues": len(self._watchers),
+            "subscribers": self.subscriber_count(),
+            "refreshes": self.refreshes,
+            "events_sent": self.events_sent,
+        }
+
+
+availability_hub = AvailabilityHub(
+    AVAILABILITY_FEED_POLL_SECONDS, AVAILABILITY_FEED_MAX_SUBSCRIBERS, AVAILABILITY_FEED_QUEUE_SIZE
+)
+
+
+def sse_event(event: str, payload: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + json_dumps(payload) + b"\n\n"
+
+
+@api_router.get("/availability/{venue_id}/stream")
+async def stream_availability(venue_id: str, search_date: str):
+    """Server-sent events: the venue's hourly availability for one date, then every change to it."""
+    await venue_snapshots.load(venue_id)
+    availability_hub.check_capacity()
+    
+    # Subscribing inside the body means a client gone before the body starts
+    # never registers, and the finally below always pairs with the subscribe
+    async def events():
+        try:
+            queue, current = await availability_hub.subscribe(venue_id, search_date)
+        except HTTPException:
+            return  # filled up since the check above; the client reconnects
+        try:
+            yield sse_event("availability", current)
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), AVAILABILITY_FEED_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield sse_event("availability", payload)
+        finally:
+            availability_hub.unsubscribe(venue_id, search_date, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# Booking Read Model
+# user_booking_views holds one document per user with "upcoming" and "past"
+# lists of the booking fields the bookings tab shows, so opening the tab is a
+# single indexed point lookup. It is kept current on every booking write;
+# a view is only read once it is marked complete, i.e. it also holds the
+# user's bookings from before it was created (see seed_booking_view).
+# Only the newest BOOKING_VIEW_PAST_LIMIT past entries are kept so the
+# document stays small; past_trimmed_date records the latest booking date
+# dropped, and pages at or below it are read from bookings instead.
+UPCOMING_BOOKING_STATUSES = ["pending", "confirmed"]
+PAST_BOOKING_STATUSES = ["cancelled", "completed", "expired", "refund_pending"]
+BOOKING_VIEW_FIELDS = [
+    "venue_id", "venue_name", "booking_date", "start_time", "end_time",
+    "total_price", "status", "payment_status"
+]
+
+
+def booking_view_entry(booking: dict) -> dict:
+    entry = {field: booking.get(field) for field in BOOKING_VIEW_FIELDS}
+    entry["_id"] = str(booking["_id"])
+    return entry
+
+
+def booking_view_filing_stages() -> list:
+    """Pipeline stages that move finished entries from upcoming to past and cap past.
+
+    Entries are appended to past as they finish, so the ones trimmed from
+    the front are the oldest.
+    """
+    upcoming = {"$ifNull": ["$upcoming", []]}
+    return [
+        {"$set": {
+            "past": {"$concatArrays": [
+                {"$ifNull": ["$past", []]},
+                {"$filter": {
+                    "input": upcoming,
+                    "cond": {"$not": {"$in": ["$$this.status", UPCOMING_BOOKING_STATUSES]}}
+                }}
+            ]},
+            "upcoming": {"$filter": {
+                "input": upcoming,
+                "cond": {"$in": ["$$this.status", UPCOMING_BOOKING_STATUSES]}
+            }}
+        }},
+        {"$set": {"kept": {"$slice": ["$past", -BOOKING_VIEW_PAST_LIMIT]}}},
+        {"$set": {"trimmed": {"$cond": [
+            {"$gt": [{"$size": "$past"}, BOOKING_VIEW_PAST_LIMIT]},
+            {"$filter": {"input": "$past", "cond": {"$not": {"$in": ["$$this._id", "$kept._id"]}}}},
+            []
+        ]}}},
+        {"$set": {
+            "past": "$kept",
+            "past_trimmed_date": {"$max": ["$past_trimmed_date", {"$max": "$trimmed.booking_date"}]}
+        }},
+        {"$project": {"kept": 0, "trimmed": 0}}
+    ]
+
+
+def booking_view_change(booking: dict) -> tuple:
+    """Filter and pipeline update that replace ``booking``'s entry in its user's view.
+
+    The entry is filed under the list its status belongs to; apply with upsert.
+    """
+    entry = booking_view_entry(booking)
+    target = "upcoming" if entry["status"] in UPCOMING_BOOKING_STATUSES else "past"
+    lists = {}
+    for name in ("upcoming", "past"):
+        others = {"$filter": {
+            "input": {"$ifNull": [f"${name}", []]},
+            "cond": {"$ne": ["$$this._id", entry["_id"]]}
+        }}
+        lists[name] = {"$concatArrays": [others, {"$literal": [entry]}]} if name == target else others
+    pipeline = [{"$set": {**lists, "updated_at": datetime.now(timezone.utc)}}, *booking_view_filing_stages()]
+    return {"user_id": booking["user_id"]}, pipeline
+
+
+async def sync_booking_view(booking: dict):
+    await db.user_booking_views.update_one(*booking_view_change(booking), upsert=True)
+
+
+async def seed_booking_view(user_id: str) -> dict:
+    """Load ``user_id``'s bookings into their view and mark it complete.
+
+    A view upserted by a booking write holds only the bookings written since;
+    rebuild_booking_views.py or this seed fill in the rest. Entries already in
+    the view are kept, as they are at least as new as the bookings read here.
+    """
+    bookings = await db.bookings.find({"user_id": user_id}, BOOKING_VIEW_FIELDS).sort(
+        [("booking_date", ASCENDING), ("_id", ASCENDING)]
+    ).to_list(None)
+    seeded = {"upcoming": [], "past": []}
+    for booking in bookings:
+        entry = booking_view_entry(booking)
+        seeded["upcoming" if entry["status"] in UPCOMING_BOOKING_STATUSES else "past"].append(entry)
+    known = {"$concatArrays": ["$upcoming._id", "$past._id"]}
+    pipeline = [
+        {"$set": {"upcoming": {"$ifNull": ["$upcoming", []]}, "past": {"$ifNull": ["$past", []]}}},
+        {"$set": {
+            name: {"$concatArrays": [
+                {"$filter": {"input": {"$literal": entries}, "cond": {"$not": {"$in": ["$$this._id", known]}}}},
+                f"${name}"
+            ]}
+            for name, entries in seeded.items()
+        }},
+        *booking_view_filing_stages(),
+        {"$set": {"complete": True, "updated_at": datetime.now(timezone.utc)}}
+    ]
+    return await db.user_booking_views.find_one_and_update(
+        {"user_id": user_id}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+    )
+
+
+def page_booking_view(entries: list, limit: int, after: Optional[str], response: Response) -> list:
+    # Same (booking_date, _id) descending order and cursor shape as paginate()
+    entries = sorted(entries, key=lambda e: (e["booking_date"], e["_id"]), reverse=True)
+    if after:
+        values = decode_cursor(after)
+        if not isinstance(values, list) or len(values) != 2:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        boundary = (values[0], str(values[1]))
+        entries = [e for e in entries if (e["booking_date"], e["_id"]) < boundary]
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            [entries[-1]["booking_date"], ObjectId(entries[-1]["_id"])]
+        )
+    return entries
+
+
+# Venue Stats Rollups
+# venue_daily_stats holds one document per venue and booking date with
+# booking counts, revenue and booked minutes, in total and by start hour.
+# Rather than applying deltas, which drift when writes race, a booking write
+# marks its venue day dirty and a per-worker flusher recomputes dirty days
+# from bookings with the same pipeline rebuild_venue_stats.py runs over all.
+EARNING_BOOKING_STATUSES = ["confirmed", "completed"]
+ROLLUP_COUNTERS = ["bookings", "confirmed", "cancelled", "expired", "revenue_paise", "booked_minutes"]
+
+
+def minutes_expr(time_field: str) -> dict:
+    return {"$add": [
+        {"$multiply": [{"$toInt": {"$substrBytes": [time_field, 0, 2]}}, 60]},
+        {"$toInt": {"$substrBytes": [time_field, 3, 2]}}
+    ]}
+
+
+def rollup_pipeline(match: Optional[dict] = None) -> list:
+    """Aggregation over bookings that replaces the matching venue days in venue_daily_stats."""
+    earning = {"$in": ["$status", EARNING_BOOKING_STATUSES]}
+    start, end = minutes_expr("$start_time"), minutes_expr("$end_time")
+    # Bookings made before integer pricing only have total_price and times;
+    # an end at or before the start runs to midnight, as in stored_interval_minutes()
+    duration = {"$ifNull": ["$duration_minutes", {"$cond": [
+        {"$gt": [end, start]}, {"$subtract": [end, start]}, {"$subtract": [MINUTES_PER_DAY, start]}
+    ]}]}
+    paise = {"$ifNull": ["$total_paise", {"$toLong": {"$round": [{"$multiply": ["$total_price", 100]}, 0]}}]}
+    
+    pipeline = [{"$match": match}] if match else []
+    pipeline += [
+        {"$group": {
+            "_id": {
+                "venue_id": "$venue_id",
+                "date": "$booking_date",
+                "hour": {"$substrBytes": ["$start_time", 0, 2]}
+            },
+            "bookings": {"$sum": 1},
+            "confirmed": {"$sum": {"$cond": [earning, 1, 0]}},
+            "cancelled": {"$sum": {"$cond": [{"$eq": ["$status", "cancelled"]}, 1, 0]}},
+            "expired": {"$sum": {"$cond": [{"$eq": ["$status", "expired"]}, 1, 0]}},
+            "revenue_paise": {"$sum": {"$cond": [earning, paise, 0]}},
+            "booked_minutes": {"$sum": {"$cond": [earning, duration, 0]}},
+        }},
+        {"$sort": {"_id.hour": 1}},
+        {"$group": {
+            "_id": {"venue_id": "$_id.venue_id", "date": "$_id.date"},
+            **{counter: {"$sum": f"${counter}"} for counter in ROLLUP_COUNTERS},
+            "hours": {"$push": {
+                "hour": "$_id.hour",
+                **{counter: f"${counter}" for counter in ROLLUP_COUNTERS}
+            }},
+        }},
+        {"$project": {
+            "_id": 0,
+            "venue_id": "$_id.venue_id",
+            "date": "$_id.date",
+            **{counter: 1 for counter in ROLLUP_COUNTERS},
+            "hours": 1,
+            "updated_at": "$$NOW"
+        }},
+        {"$merge": {
+            "into": "venue_daily_stats",
+            "on": ["venue_id", "date"],
+            "whenMatched": "replace",
+            "whenNotMatched": "insert"
+        }}
+    ]
+    return pipeline
+
+
+class RollupUpdater:
+    """Recomputes the venue days this worker's booking writes touched.
+
+    Marks are kept in memory and flushed every ROLLUP_FLUSH_SECONDS, one
+    aggregation per ROLLUP_BATCH_SIZE days. Marks lost with a crashed worker
+    leave those days stale until they are written again or the rollups are
+    rebuilt with rebuild_venue_stats.py.
+    """
+
+    def __init__(self, flush_seconds: float, batch_size: int):
+        self.flush_seconds = flush_seconds
+        self.batch_size = batch_size
+        self._dirty: set = set()
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.days_recomputed = 0
+        self.errors = 0
+
+    def mark(self, venue_id: str, booking_date: str):
+        self._dirty.add((venue_id, booking_date))
+
+    async def flush(self):
+        dirty, self._dirty = list(self._dirty), set()
+        for i in range(0, len(dirty), self.batch_size):
+            batch = dirty[i:i + self.batch_size]
+            match = {"$or": [{"venue_id": venue_id, "booking_date": date} for venue_id, date in batch]}
+            try:
+                await db.bookings.aggregate(rollup_pipeline(match)).to_list(None)
+            except Exception:
+                self._dirty.update(dirty[i:])
+                raise
+            self.days_recomputed += len(batch)
+        if dirty:
+            self.flushes += 1
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                self.errors += 1
+                logger.exception("Venue stats rollup flush failed")
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final venue stats rollup flush failed")
+
+    def stats(self) -> dict:
+        return {
+            "pending_days": len(self._dirty),
+            "flushes": self.flushes,
+            "days_recomputed": self.days_recomputed,
+            "errors": self.errors,
+        }
+
+
+rollups = RollupUpdater(ROLLUP_FLUSH_SECONDS, ROLLUP_BATCH_SIZE)
+
+
+def utilization(booked_minutes: int, open_minutes: int) -> float:
+    return round(booked_minutes / open_minutes, 4) if open_minutes > 0 else 0.0
+
+
+@api_router.get("/venues/{venue_id}/dashboard")
+async def get_venue_dashboard(venue_id: str, start_date: str, end_date: str):
+    """Bookings, revenue, cancellations and utilization per day and by start hour."""
+    try:
+        first = datetime.strptime(start_date, "%Y-%m-%d")
+        last = datetime.strptime(end_date, "%Y-%m-%d")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    day_count = (last - first).days + 1
+    if not 0 < day_count <= DASHBOARD_MAX_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Date range must cover between 1 and {DASHBOARD_MAX_DAYS} days"
+        )
+    venue = await venue_snapshots.load(venue_id)
+    open_minutes = venue.closing - venue.opening
+    
+    days = await db.venue_daily_stats.find(
+        {"venue_id": venue_id, "date": {"$gte": start_date, "$lte": end_date}},
+        {"_id": 0, "venue_id": 0, "updated_at": 0}
+    ).sort("date", ASCENDING).to_list(None)
+    
+    totals = {counter: 0 for counter in ROLLUP_COUNTERS}
+    hours: dict = {}
+    for day in days:
+        for counter in ROLLUP_COUNTERS:
+            totals[counter] += day[counter]
+        for hour in day.pop("hours", []):
+            bucket = hours.setdefault(hour["hour"], {counter: 0 for counter in ROLLUP_COUNTERS})
+            for counter in ROLLUP_COUNTERS:
+                bucket[counter] += hour[counter]
+        day["utilization"] = utilization(day["booked_minutes"], open_minutes)
+    # Days without any booking count towards the capacity of the range too
+    totals["utilization"] = utilization(totals["booked_minutes"], open_minutes * day_count)
+    
+    return {
+        "venue_id": venue_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "totals": totals,
+        "days": days,
+        "hours": [{"hour": hour, **hours[hour]} for hour in sorted(hours)],
+    }
+
+
+# Idempotency Keys
+class IdempotencyStore:
+    """Replays the stored response of a write retried with the same key.
+
+    The first request claims ``scope:key`` by inserting an in-progress record
+    into ``idempotency_keys``; the unique ``_id`` makes concurrent retries on
+    any worker get a 409 instead of repeating the write. The claim expires
+    after IDEMPOTENCY_LOCK_SECONDS, so a worker dying mid-request does not
+    lock the key for good. Finished responses, errors included but not 5xx,
+    are stored and replayed byte for byte until the TTL index drops them;
+    replays this process has seen are answered from memory.
+    """
+
+    def __init__(self, ttl_hours: float, lock_seconds: int, cache_size: int):
+        self.ttl = timedelta(hours=ttl_hours)
+        self.lock = timedelta(seconds=lock_seconds)
+        self.cache = TTLCache(cache_size, ttl_hours * 3600)
+        self.replays = 0
+        self.conflicts = 0
+
+    async def run(self, key: Optional[str], scope: str, params: dict, handler,
+                  status_code: int = 200):
+        if key is None:
+            return await handler()
+        record_id = f"{scope}:{key}"
+        fingerprint = hashlib.sha256(json_util.dumps(params, sort_keys=True).encode()).hexdigest()
+        
+        record = self.cache.get(record_id)
+        if record is not None:
+            return self.replay(record, fingerprint)
+        
+        now = datetime.now(timezone.utc)
+        try:
+            await db.idempotency_keys.insert_one({
+                "_id": record_id,
+                "fingerprint": fingerprint,
+                "state": "in_progress",
+                "created_at": now,
+                "expires_at": now + self.lock,
+            })
+        except DuplicateKeyError:
+            record = await db.idempotency_keys.find_one({"_id": record_id})
+            if record is None or record["state"] != "done":
+                self.conflicts += 1
+                raise HTTPException(
+                    status_code=409, detail="A request with this Idempotency-Key is in progress"
+                )
+            self.cache.set(record_id, record, expires_at=record["expires_at"].replace(tzinfo=timezone.utc))
+            return self.replay(record, fingerprint)
+        
+        try:
+            response = FastJSONResponse(await handler(), status_code=status_code)
+        except HTTPException as e:
+            if e.status_code >= 500:
+                await db.idempotency_keys.delete_one({"_id": record_id})
+                raise
+            response = FastJSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+        except BaseException:
+            await db.idempotency_keys.delete_one({"_id": record_id})
+            raise
+        
+        record = {
+            "fingerprint": fingerprint,
+            "state": "done",
+            "status_code": response.status_code,
+            "body": response.body,
+            "expires_at": datetime.now(timezone.utc) + self.ttl,
+        }
+        await db.idempotency_keys.update_one({"_id": record_id}, {"$set": record})
+        self.cache.set(record_id, record, expires_at=record["expires_at"])
+        return response
+
+    def replay(self, record: dict, fingerprint: str) -> Response:
+        if record["fingerprint"] != fingerprint:
+            raise HTTPException(
+                status_code=422, detail="Idempotency-Key was already used with different parameters"
+            )
+        self.replays += 1
+        return Response(
+            content=record["body"],
+            status_code=record["status_code"],
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "replays": self.replays, "conflicts": self.conflicts}
+
+
+idempotency_store = IdempotencyStore(IDEMPOTENCY_TTL_HOURS, IDEMPOTENCY_LOCK_SECONDS, IDEMPOTENCY_CACHE_SIZE)
 
 
 # Booking Routes
 @api_router.post("/bookings", status_code=201)
-async def create_booking(booking: BookingCreate):
-    # Get venue details
-    venue = await db.venues.find_one({"_id": str_to_objectid(booking.venue_id)})
-    if not venue:
-        raise HTTPException(status_code=404, detail="Venue not found")
+async def create_booking(
+    booking: BookingCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255)
+):
+    return await idempotency_store.run(
+        idempotency_key, "create_booking", booking.dict(), lambda: place_booking(booking), 201
+    )
+
+
+async def place_booking(booking: BookingCreate) -> dict:
+    venue = await venue_snapshots.load(booking.venue_id)
     
-    # Calculate total price
-    start = datetime.strptime(booking.start_time, "%H:%M")
-    end = datetime.strptime(booking.end_time, "%H:%M")
-    hours = (end - start).seconds / 3600
-    total_price = hours * venue['price_per_hour']
+    # Reject times outside opening hours or overlapping other bookings
+    try:
+        start_minute, end_minute = interval_minutes(booking.start_time, booking.end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    availability = await load_day_availability(booking.venue_id, booking.booking_date, venue)
+    if not availability.is_free(start_minute, end_minute):
+        raise HTTPException(status_code=409, detail="Requested time is not available")
+    
+    duration_minutes = end_minute - start_minute
+    total_paise = venue.price_paise(duration_minutes)
+    
+    booking_oid = ObjectId()
+    if not await claim_slot(
+        booking.venue_id, booking.booking_date, booking.start_time, booking.end_time, str(booking_oid)
+    ):
+        raise HTTPException(status_code=409, detail="Slot is no longer available")
+    invalidate_availability(booking.venue_id, booking.booking_date)
     
     booking_dict = booking.dict()
-    booking_dict['venue_name'] = venue['name']
-    booking_dict['total_price'] = total_price
+    booking_dict['_id'] = booking_oid
+    booking_dict['venue_name'] = venue.name
+    booking_dict['duration_minutes'] = duration_minutes
+    booking_dict['total_paise'] = total_paise
+    booking_dict['total_price'] = total_paise / 100  # rupees, for existing clients
     booking_dict['status'] = 'pending'
     booking_dict['payment_status'] = 'pending'
     booking_dict['created_at'] = datetime.now(timezone.utc)
     
-    result = await db.bookings.insert_one(booking_dict)
-    booking_dict['_id'] = str(result.inserted_id)
+    try:
+        await db.bookings.insert_one(booking_dict)
+    except Exception:
+        await release_slot(booking_dict)
+        raise
+    await sync_booking_view(booking_dict)
+    rollups.mark(booking.venue_id, booking.booking_date)
+    booking_dict['_id'] = str(booking_oid)
     return booking_dict
 
 @api_router.get("/bookings/user/{user_id}")
-async def get_user_bookings(user_id: str, status: str = "upcoming"):
-    query = {"user_id": user_id}
+async def get_user_bookings(
+    user_id: str,
+    response: Response,
+    status: str = "upcoming",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    view = await db.user_booking_views.find_one({"user_id": user_id})
+    if view is None or not view.get("complete"):
+        # First read since the view was created by a write (or never was)
+        view = await seed_booking_view(user_id)
     
+    # Bookings whose date has passed count as past whatever their status
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    upcoming, lapsed = [], []
+    for entry in view.get("upcoming", []):
+        is_upcoming = entry["booking_date"] >= today and entry["status"] in UPCOMING_BOOKING_STATUSES
+        (upcoming if is_upcoming else lapsed).append(entry)
     if status == "upcoming":
-        query['status'] = {"$in": ["pending", "confirmed"]}
-    else:
-        query['status'] = {"$in": ["cancelled", "completed"]}
-    
-    bookings = await db.bookings.find(query).sort("booking_date", -1).to_list(100)
-    for booking in bookings:
-        booking['_id'] = str(booking['_id'])
-    return bookings
+        return json_page(page_booking_view(upcoming, limit, after, response), response)
+    entries = view.get("past", []) + lapsed
+    trimmed_date = view.get("past_trimmed_date")
+    if not trimmed_date:
+        return json_page(page_booking_view(entries, limit, after, response), response)
+    # The view is only complete above the newest trimmed date; the rest
+    # of the page continues from bookings at the same cursor
+    entries = [entry for entry in entries if entry["booking_date"] > trimmed_date]
+    page = page_booking_view(entries, limit, after, response)
+    if "X-Next-Cursor" in response.headers:
+        return json_page(page, response)
+    if page:
+        after = encode_cursor([page[-1]["booking_date"], ObjectId(page[-1]["_id"])])
+    if len(page) == limit:
+        response.headers["X-Next-Cursor"] = after
+        return json_page(page, response)
+    page += await paginate(
+        db.bookings, {"user_id": user_id, "status": {"$in": PAST_BOOKING_STATUSES}},
+        [("booking_date", DESCENDING), ("_id", DESCENDING)], limit - len(page), after, response,
+        projection=BOOKING_VIEW_FIELDS
+    )
+    return json_page(page, response)
 
 @api_router.get("/bookings/venue/{venue_id}")
-async def get_venue_bookings(venue_id: str):
-    bookings = await db.bookings.find({"venue_id": venue_id}).sort("booking_date", -1).to_list(100)
-    for booking in bookings:
-        booking['_id'] = str(booking['_id'])
-    return bookings
+async def get_venue_bookings(
+    venue_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    docs = await paginate(
+        db.bookings, {"venue_id": venue_id}, [("booking_date", DESCENDING), ("_id", DESCENDING)],
+        limit, after, response
+    )
+    return json_page(docs, response)
+
+@api_router.get("/bookings/venue/{venue_id}/export")
+async def export_venue_bookings(
+    venue_id: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None
+):
+    query = {"venue_id": venue_id}
+    # booking_date is stored as YYYY-MM-DD, so string comparison is date order
+    if from_date or to_date:
+        query['booking_date'] = {}
+        if from_date:
+            parse_export_date(from_date)
+            query['booking_date']['$gte'] = from_date
+        if to_date:
+            parse_export_date(to_date)
+            query['booking_date']['$lte'] = to_date
+    
+    cursor = db.bookings.find(query).sort(
+        [("booking_date", DESCENDING), ("_id", DESCENDING)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+    return stream_export(cursor, BOOKING_EXPORT_FIELDS, export_format, f"bookings_{venue_id}")
 
 @api_router.put("/bookings/{booking_id}/status")
 async def update_booking_status(booking_id: str, status: str):
-    result = await db.bookings.update_one(
+    if status == "confirmed":
+        # The slot must be secured before the booking may say confirmed
+        current = await db.bookings.find_one({"_id": str_to_objectid(booking_id)}, BOOKING_VIEW_FIELDS)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        if not await confirm_slot(current):
+            invalidate_availability(current['venue_id'], current['booking_date'])
+            raise HTTPException(status_code=409, detail="Slot was taken by another booking")
+    booking = await db.bookings.find_one_and_update(
         {"_id": str_to_objectid(booking_id)},
-        {"$set": {"status": status}}
+        {"$set": {"status": status}},
+        projection=["user_id", *BOOKING_VIEW_FIELDS],
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if booking is None:
         raise HTTPException(status_code=404, detail="Booking not found")
+    await sync_booking_view(booking)
+    invalidate_availability(booking['venue_id'], booking['booking_date'])
+    rollups.mark(booking['venue_id'], booking['booking_date'])
+    if status == "cancelled":
+        await release_slot(booking)
     return {"message": "Booking status updated"}
 
 @api_router.put("/bookings/{booking_id}/payment")
-async def update_payment_status(booking_id: str, payment_status: str, payment_id: str):
-    result = await db.bookings.update_one(
+async def update_payment_status(
+    booking_id: str,
+    payment_status: str,
+    payment_id: str,
+    idempotency_key: Optional[str] = Header(None, max_length=255)
+):
+    params = {"booking_id": booking_id, "payment_status": payment_status, "payment_id": payment_id}
+    return await idempotency_store.run(
+        idempotency_key, "update_payment_status", params,
+        lambda: apply_payment_status(booking_id, payment_status, payment_id)
+    )
+
+
+async def apply_payment_status(booking_id: str, payment_status: str, payment_id: str) -> dict:
+    status = "pending"
+    if payment_status == "completed":
+        current = await db.bookings.find_one({"_id": str_to_objectid(booking_id)}, BOOKING_VIEW_FIELDS)
+        if current is None:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        # A hold that lapsed before the payment landed may have gone to
+        # someone else; the payment is still recorded, for a refund
+        status = "confirmed" if await confirm_slot(current) else "refund_pending"
+    booking = await db.bookings.find_one_and_update(
         {"_id": str_to_objectid(booking_id)},
         {"$set": {
             "payment_status": payment_status,
             "payment_id": payment_id,
-            "status": "confirmed" if payment_status == "completed" else "pending"
-        }}
+            "status": status
+        }},
+        projection=["user_id", *BOOKING_VIEW_FIELDS],
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if booking is None:
         raise HTTPException(status_code=404, detail="Booking not found")
+    await sync_booking_view(booking)
+    invalidate_availability(booking['venue_id'], booking['booking_date'])
+    rollups.mark(booking['venue_id'], booking['booking_date'])
+    if status == "refund_pending":
+        logger.warning("Payment completed for booking %s but its slot was taken; refund needed", booking_id)
+        raise HTTPException(
+            status_code=409, detail="Slot was taken by another booking; the payment will be refunded"
+        )
     return {"message": "Payment status updated"}
 
 
+async def apply_booking_updates(updates: List[tuple],
+                                slot_taken_status: Optional[str] = None) -> List[dict]:
+    """Apply ``(booking_id, fields)`` pairs with one unordered bulk_write.
+
+    Returns one result per update, in request order. Bookings being
+    confirmed get their slots first, as in the single-booking routes; when
+    another booking holds the time the item fails with "slot_taken" and is
+    skipped, or, if ``slot_taken_status`` is given, written with that status
+    instead. Views, slot releases and cached availability of the bookings
+    that changed are then brought in line with one bulk write per collection.
+    """
+    results = [{"booking_id": booking_id, "ok": False} for booking_id, _ in updates]
+    valid = []
+    for i, (booking_id, _) in enumerate(updates):
+        if ObjectId.is_valid(booking_id):
+            valid.append(i)
+        else:
+            results[i]["error"] = "invalid_id"
+    
+    confirming = list({updates[i][0] for i in valid if updates[i][1].get("status") == "confirmed"})
+    slot_taken, touched = set(), {}
+    if confirming:
+        current = await db.bookings.find(
+            {"_id": {"$in": [ObjectId(booking_id) for booking_id in confirming]}}, BOOKING_VIEW_FIELDS
+        ).to_list(None)
+        secured = await asyncio.gather(*(confirm_slot(doc) for doc in current))
+        for doc, ok in zip(current, secured):
+            touched[str(doc["_id"])] = doc
+            if not ok:
+                slot_taken.add(str(doc["_id"]))
+        missing = set(confirming) - set(touched)
+        for i in valid:
+            if updates[i][0] in missing:
+                results[i]["error"] = "not_found"
+        valid = [i for i in valid if updates[i][0] not in missing]
+    
+    ops, positions = [], []
+    for i in valid:
+        booking_id, fields = updates[i]
+        if booking_id in slot_taken:
+            results[i]["error"] = "slot_taken"
+            if slot_taken_status is None:
+                continue
+            fields = {**fields, "status": slot_taken_status}
+        ops.append(UpdateOne({"_id": ObjectId(booking_id)}, {"$set": fields}))
+        positions.append(i)
+    
+    failed = set()
+    if ops:
+        try:
+            await db.bookings.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = {positions[error["index"]] for error in e.details["writeErrors"]}
+    
+    oids = list({ObjectId(updates[i][0]) for i in positions if i not in failed})
+    docs = await db.bookings.find(
+        {"_id": {"$in": oids}}, ["user_id", *BOOKING_VIEW_FIELDS]
+    ).to_list(None) if oids else []
+    changed = {str(doc["_id"]): doc for doc in docs}
+    for i in positions:
+        if i in failed:
+            results[i]["error"] = "write_failed"
+        elif results[i]["booking_id"] not in changed:
+            results[i]["error"] = "not_found"
+        elif "error" not in results[i]:
+            results[i]["ok"] = True
+    
+    if changed:
+        await db.user_booking_views.bulk_write(
+            [UpdateOne(*booking_view_change(doc), upsert=True) for doc in changed.values()], ordered=False
+        )
+    cancelled = [doc for doc in changed.values() if doc["status"] == "cancelled"]
+    if cancelled:
+        releases = [
+            write for doc in cancelled
+            for write in release_slot_writes(doc['venue_id'], doc['booking_date'], str(doc['_id']))
+        ]
+        await db.slots.bulk_write(releases, ordered=False)
+    for booking_id in slot_taken - set(changed):
+        logger.warning("Booking %s could not be confirmed; its slot was taken", booking_id)
+    for doc in {**touched, **changed}.values():
+        invalidate_availability(doc['venue_id'], doc['booking_date'])
+        rollups.mark(doc['venue_id'], doc['booking_date'])
+    return results
+
+
+@api_router.post("/bookings/status/bulk")
+async def update_booking_status_bulk(batch: BookingStatusBatch):
+    results = await apply_booking_updates(
+        [(update.booking_id, {"status": update.status}) for update in batch.updates]
+    )
+    return {"updated": sum(result["ok"] for result in results), "results": results}
+
+
+@api_router.post("/bookings/payment/bulk")
+async def update_payment_status_bulk(
+    batch: PaymentStatusBatch,
+    idempotency_key: Optional[str] = Header(None, max_length=255)
+):
+    """Reconcile many payment results at once, e.g. a gateway's daily settlement."""
+    async def reconcile():
+        results = await apply_booking_updates([
+            (update.booking_id, {
+                "payment_status": update.payment_status,
+                "payment_id": update.payment_id,
+                "status": "confirmed" if update.payment_status == "completed" else "pending"
+            })
+            for update in batch.updates
+        ], slot_taken_status="refund_pending")
+        return {"updated": sum(result["ok"] for result in results), "results": results}
+    
+    return await idempotency_store.run(
+        idempotency_key, "update_payment_status_bulk", batch.dict(), reconcile
+    )
+
+
 # Review Routes
 @api_router.post("/reviews", status_code=201)
 async def create_review(review: ReviewCreate):
+    venue_oid = str_to_objectid(review.venue_id)
     review_dict = review.dict()
     review_dict['created_at'] = datetime.now(timezone.utc)
     result = await db.reviews.insert_one(review_dict)
     
-    # Update venue rating
-    reviews = await db.reviews.find({"venue_id": review.venue_id}).to_list(1000)
-    avg_rating = sum([r['rating'] for r in reviews]) / len(reviews)
-    await db.venues.update_one(
-        {"_id": str_to_objectid(review.venue_id)},
-        {"$set": {"rating": avg_rating, "total_reviews": len(reviews)}}
+    # Update venue rating in place. Venues created before rating_sum existed
+    # fall back to rating * total_reviews as their running sum.
+    venue = await db.venues.find_one_and_update(
+        {"_id": venue_oid},
+        [
+            {"$set": {
+                "rating_sum": {"$add": [
+                    {"$ifNull": ["$rating_sum", {"$multiply": [
+                        {"$ifNull": ["$rating", 0]},
+                        {"$ifNull": ["$total_reviews", 0]}
+                    ]}]},
+                    review.rating
+                ]},
+                "total_reviews": {"$add": [{"$ifNull": ["$total_reviews", 0]}, 1]}
+            }},
+            {"$set": {"rating": {"$divide": ["$rating_sum", "$total_reviews"]}}}
+        ],
+        projection={"categories": 1, "location_key": 1}
     )
+    if venue:
+        search_cache.invalidate_venue(venue.get("categories", []), venue.get("location_key"))
     
     review_dict['_id'] = str(result.inserted_id)
     return review_dict
 
+@api_router.get("/reviews/venue/{venue_id}/export")
+async def export_venue_reviews(
+    venue_id: str,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None
+):
+    query = {"venue_id": venue_id}
+    if from_date or to_date:
+        query['created_at'] = {}
+        if from_date:
+            query['created_at']['$gte'] = parse_export_date(from_date)
+        if to_date:
+            query['created_at']['$lt'] = parse_export_date(to_date) + timedelta(days=1)
+    
+    cursor = db.reviews.find(query).sort(
+        [("created_at", DESCENDING), ("_id", DESCENDING)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+    return stream_export(cursor, REVIEW_EXPORT_FIELDS, export_format, f"reviews_{venue_id}")
+
 @api_router.get("/reviews/venue/{venue_id}")
-async def get_venue_reviews(venue_id: str):
-    reviews = await db.reviews.find({"venue_id": venue_id}).sort("created_at", -1).to_list(100)
-    for review in reviews:
-        review['_id'] = str(review['_id'])
-    return reviews
+async def get_venue_reviews(
+    venue_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[str] = None
+):
+    docs = await paginate(
+        db.reviews, {"venue_id": venue_id}, [("created_at", DESCENDING), ("_id", DESCENDING)],
+        limit, after, response
+    )
+    return json_page(docs, response)
+
+
+# Booking Lifecycle Jobs
+async def transition_bookings(query: dict, status: str) -> int:
+    """Move bookings matching ``query`` to ``status`` in batches.
+
+    Views are patched with one update per batch, which moves the entries
+    from the upcoming list to the past list.
+    """
+    transitioned = 0
+    while True:
+        batch = await db.bookings.find(
+            query, {"user_id": 1, "venue_id": 1, "booking_date": 1}
+        ).limit(BOOKING_SWEEP_BATCH_SIZE).to_list(None)
+        if not batch:
+            return transitioned
+        ids = [booking["_id"] for booking in batch]
+        # Views first: if the bookings update then fails, the next run retries both
+        await db.user_booking_views.update_many(
+            {"user_id": {"$in": list({booking["user_id"] for booking in batch})}},
+            [{"$set": {"upcoming": {"$map": {
+                "input": {"$ifNull": ["$upcoming", []]},
+                "in": {"$cond": [
+                    {"$in": ["$$this._id", [str(booking_id) for booking_id in ids]]},
+                    {**{field: f"$$this.{field}" for field in ["_id", *BOOKING_VIEW_FIELDS]},
+                     "status": {"$literal": status}},
+                    "$$this"
+                ]}
+            }}}}, *booking_view_filing_stages()]
+        )
+        result = await db.bookings.update_many({**query, "_id": {"$in": ids}}, {"$set": {"status": status}})
+        transitioned += result.modified_count
+        for booking in batch:
+            rollups.mark(booking["venue_id"], booking["booking_date"])
+        if len(batch) < BOOKING_SWEEP_BATCH_SIZE:
+            return transitioned
+
+
+async def complete_past_bookings() -> int:
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    return await transition_bookings({"status": "confirmed", "booking_date": {"$lt": today}}, "completed")
+
+
+async def expire_unpaid_bookings() -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=PENDING_BOOKING_MINUTES)
+    expired = await transition_bookings(
+        {"status": "pending", "payment_status": "pending", "created_at": {"$lte": cutoff}},
+        "expired"
+    )
+    if expired:
+        # Their slot holds have lapsed by now as well
+        await sweep_expired_holds()
+    return expired
+
+
+async def sweep_expired_holds() -> int:
+    released = await release_expired_holds()
+    if released:
+        availability_cache.clear()
+    return released
+
+
+# Scheduler
+class Scheduler:
+    """Runs periodic jobs on the event loop of whichever worker holds the lease.
+
+    Every worker starts a scheduler, but only the one holding the
+    ``scheduler_leases`` document runs jobs; if it dies, another worker takes
+    over once the lease expires. Intervals are jittered so sweeps from
+    restarted workers don't line up.
+    """
+
+    def __init__(self, lease_name: str, lease_seconds: int):
+        self.lease_name = lease_name
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.is_leader = False
+        self.jobs: dict = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def add_job(self, name: str, fn, interval: float, jitter: float = 0.1):
+        self.jobs[name] = {
+            "fn": fn,
+            "interval": interval,
+            "jitter": jitter,
+            "runs": 0,
+            "errors": 0,
+            "last_run_at": None,
+            "last_duration_seconds": None,
+            "last_transitioned": 0,
+            "total_transitioned": 0,
+        }
+
+    async def _renew_lease(self) -> bool:
+        now = datetime.now(timezone.utc)
+        try:
+            await db.scheduler_leases.update_one(
+                {"_id": self.lease_name, "$or": [{"owner": self.worker_id}, {"expires_at": {"$lte": now}}]},
+                {"$set": {"owner": self.worker_id, "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def _lease_loop(self):
+        while True:
+            try:
+                was_leader, self.is_leader = self.is_leader, await self._renew_lease()
+                if self.is_leader != was_leader:
+                    logger.info("Scheduler %s %s leadership", self.worker_id,
+                                "acquired" if self.is_leader else "lost")
+            except Exception:
+                self.is_leader = False
+                logger.exception("Scheduler lease renewal failed")
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _job_loop(self, name: str):
+        job = self.jobs[name]
+        while True:
+            await asyncio.sleep(job["interval"] * random.uniform(1 - job["jitter"], 1 + job["jitter"]))
+            if not self.is_leader:
+                continue
+            started = datetime.now(timezone.utc)
+            try:
+                transitioned = await job["fn"]()
+            except Exception:
+                job["errors"] += 1
+                logger.exception("Scheduled job %s failed", name)
+                continue
+            job["runs"] += 1
+            job["last_run_at"] = started
+            job["last_duration_seconds"] = (datetime.now(timezone.utc) - started).total_seconds()
+            job["last_transitioned"] = transitioned
+            job["total_transitioned"] += transitioned
+            if transitioned:
+                logger.info("Scheduled job %s transitioned %d documents", name, transitioned)
+
+    def start(self):
+        self._tasks.append(asyncio.create_task(self._lease_loop()))
+        for name in self.jobs:
+            self._tasks.append(asyncio.create_task(self._job_loop(name)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self.is_leader:
+            # Hand over straight away instead of waiting for the lease to expire
+            await db.scheduler_leases.delete_one({"_id": self.lease_name, "owner": self.worker_id})
+            self.is_leader = False
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "is_leader": self.is_leader,
+            "jobs": {
+                name: {k: v for k, v in job.items() if k != "fn"}
+                for name, job in self.jobs.items()
+            },
+        }
+
+
+scheduler = Scheduler("booking-lifecycle", SCHEDULER_LEASE_SECONDS)
+scheduler.add_job("release_expired_holds", sweep_expired_holds, SLOT_HOLD_SWEEP_SECONDS)
+scheduler.add_job("expire_unpaid_bookings", expire_unpaid_bookings, BOOKING_SWEEP_SECONDS)
+scheduler.add_job("complete_past_bookings", complete_past_bookings, BOOKING_SWEEP_SECONDS)
+
+
+# Metrics Routes
+@api_router.get("/metrics")
+async def get_metrics():
+    return {
+        "session_cache": session_cache.stats(),
+        "search_cache": search_cache.stats(),
+        "availability_cache": availability_cache.stats(),
+        "venue_snapshots": venue_snapshots.stats(),
+        "availability_feed": availability_hub.stats(),
+        "rollups": rollups.stats(),
+        "scheduler": scheduler.stats(),
+        "oauth_breaker": oauth_breaker.stats(),
+        "mongo": mongo_monitor.stats(),
+        "password_hasher": password_hasher.stats(),
+        "idempotency": idempotency_store.stats(),
+        "json_backend": json_backend,
+    }
+
+
+@api_router.get("/metrics/prometheus")
+async def get_prometheus_metrics():
+    return Response(
+        content=request_metrics.prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@api_router.get("/metrics/profiles")
+async def get_profiles():
+    return list(request_metrics.profiles)
+
+
+@api_router.get("/health")
+async def health(response: Response):
+    started = time.perf_counter()
+    try:
+        await db.command("ping")
+    except Exception as e:
+        logger.warning("Health check ping failed: %s", e)
+        response.status_code = 503
+        return {"status": "unavailable", "mongo": {"ok": False, "error": str(e)}}
+    return {
+        "status": "ok",
+        "mongo": {
+            "ok": True,
+            "ping_ms": round((time.perf_counter() - started) * 1000, 3),
+            "checked_out": mongo_monitor.checked_out
+        }
+    }
 
 
 @api_router.get("/")
@@ -526,9 +3265,200 @@ async def root():
     return {"message": "Playslot API - Ready to serve!"}
 
 
+# Request Metrics
+class StackSampler:
+    """Samples one thread's Python stack from a background thread.
+
+    Pointed at the event loop thread it sees every coroutine running there,
+    so samples of a profiled request include whatever ran concurrently.
+    """
+
+    def __init__(self, thread_id: int, interval_ms: float):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+class RequestMetrics:
+    """Per-route latency, DB time, handler time and response size histograms."""
+
+    def __init__(self):
+        self.routes: dict = {}
+        self.profiles = deque(maxlen=PROFILE_KEEP)
+        self.profiling = False
+
+    def observe(self, method: str, route: str, status: int, duration_ms: float,
+                db_ms: float, size_bytes: int):
+        key = (method, route)
+        if key not in self.routes:
+            self.routes[key] = {
+                "duration_ms": Histogram(),
+                "db_ms": Histogram(),
+                "handler_ms": Histogram(),
+                "response_bytes": Histogram(SIZE_BUCKETS_BYTES),
+                "status": Counter(),
+            }
+        metrics = self.routes[key]
+        metrics["duration_ms"].observe(duration_ms)
+        metrics["db_ms"].observe(db_ms)
+        metrics["handler_ms"].observe(max(duration_ms - db_ms, 0.0))
+        metrics["response_bytes"].observe(size_bytes)
+        metrics["status"][str(status)] += 1
+
+    def prometheus(self) -> str:
+        lines = []
+        for name, help_text in [
+            ("duration_ms", "Request latency in milliseconds"),
+            ("db_ms", "Time spent in MongoDB commands per request in milliseconds"),
+            ("handler_ms", "Request time outside MongoDB commands in milliseconds"),
+            ("response_bytes", "Response body size in bytes"),
+        ]:
+            metric = f"playslot_http_request_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (method, route), metrics in self.routes.items():
+                labels = f'method="{method}",route="{route}"'
+                histogram = metrics[name]
+                for bound, count in histogram.cumulative_buckets():
+                    lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.3f}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.total}")
+        
+        metric = "playslot_http_responses_total"
+        lines += [f"# HELP {metric} Responses by route and status", f"# TYPE {metric} counter"]
+        for (method, route), metrics in self.routes.items():
+            for status, count in metrics["status"].items():
+                lines.append(f'{metric}{{method="{method}",route="{route}",status="{status}"}} {count}')
+        
+        mongo = mongo_monitor.stats()
+        metric = "playslot_mongo_command_duration_ms"
+        lines += [f"# HELP {metric} MongoDB command latency in milliseconds", f"# TYPE {metric} histogram"]
+        for command, histogram in mongo["commands"]["latency_ms"].items():
+            for bound, count in histogram["buckets"].items():
+                lines.append(f'{metric}_bucket{{command="{command}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{command="{command}"}} {histogram["sum"]:.3f}')
+            lines.append(f'{metric}_count{{command="{command}"}} {histogram["count"]}')
+        lines += [
+            "# HELP playslot_mongo_pool_checked_out Connections currently checked out",
+            "# TYPE playslot_mongo_pool_checked_out gauge",
+            f"playslot_mongo_pool_checked_out {mongo['pool']['checked_out']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    """Times every HTTP request and records it under its route template.
+
+    A request is profiled when PROFILE_SAMPLE_RATE selects it or when it
+    carries ``X-Profile: <PROFILE_TOKEN>``; its stack samples are kept if it
+    was explicitly requested or ran longer than PROFILE_SLOW_MS.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        requested = bool(PROFILE_TOKEN) and any(
+            name == b"x-profile" and value.decode() == PROFILE_TOKEN for name, value in scope["headers"]
+        )
+        sampler = None
+        if (requested or random.random() < PROFILE_SAMPLE_RATE) and not request_metrics.profiling:
+            request_metrics.profiling = True
+            sampler = StackSampler(threading.get_ident(), PROFILE_INTERVAL_MS)
+            sampler.start()
+        
+        db_time = [0.0]
+        token = request_db_time.set(db_time)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            request_db_time.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            request_metrics.observe(scope["method"], route_path, status, duration_ms, db_time[0], size)
+            if sampler:
+                samples = await asyncio.to_thread(sampler.stop)
+                request_metrics.profiling = False
+                if requested or duration_ms >= PROFILE_SLOW_MS:
+                    request_metrics.profiles.append({
+                        "method": scope["method"],
+                        "route": route_path,
+                        "path": scope["path"],
+                        "duration_ms": round(duration_ms, 3),
+                        "db_ms": round(db_time[0], 3),
+                        "at": datetime.now(timezone.utc),
+                        "samples": dict(samples.most_common(50)),
+                    })
+                    logger.info("Profiled %s %s in %.1fms (%d stacks)",
+                                scope["method"], scope["path"], duration_ms, len(samples))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    connect_mongo()
+    http_client = create_http_client()
+    await ensure_indexes()
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    rollups.start()
+    yield
+    await scheduler.stop()
+    await availability_hub.stop()
+    await rollups.stop()
+    await http_client.aclose()
+    password_hasher.shutdown()
+    close_mongo()
+
+
+# Create the main app without a prefix
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+
 # Register the router
 app.include_router(api_router)
 
+app.add_middleware(RequestMetricsMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -536,4 +3466,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
@@ -48,6 +48,7 @@ export default function Home() {
       if (selectedCategory !== 'all') params.category = selectedCategory;
       if (selectedDate) params.date = selectedDate;
       if (location) params.location = location;
+      params.view = 'card';
 
       const response = await axios.get(`${API_URL}/api/venues/search`, { params });
       setVenues(response.data);
@@ -19,6 +19,12 @@ import { useTheme } from '../../context/ThemeContext';
 
 const API_URL = Constants.expoConfig?.extra?.EXPO_PUBLIC_BACKEND_URL || process.env.EXPO_PUBLIC_BACKEND_URL;
 
+// Availability feed reconnect backoff, and how much of one stream is read
+// before the request is restarted to release its buffered response text
+const FEED_RETRY_MIN_MS = 1000;
+const FEED_RETRY_MAX_MS = 30000;
+const FEED_MAX_BUFFER = 64 * 1024;
+
 export default function VenueDetail() {
   const { id } = useLocalSearchParams();
   const router = useRouter();
@@ -36,10 +42,9 @@ export default function VenueDetail() {
   }, [id]);
 
   useEffect(() => {
-    if (selectedDate) {
-      generateTimeSlots();
-    }
-  }, [selectedDate]);
+    if (!selectedDate) return;
+    return subscribeToAvailability(selectedDate);
+  }, [id, selectedDate]);
 
   const fetchVenueDetails = async () => {
     try {
@@ -53,14 +58,92 @@ export default function VenueDetail() {
     }
   };
 
-  const generateTimeSlots = () => {
-    const slots = [];
-    for (let hour = 6; hour <= 22; hour++) {
-      const startTime = `${hour.toString().padStart(2, '0')}:00`;
-      const endTime = `${(hour + 1).toString().padStart(2, '0')}:00`;
-      slots.push(`${startTime} - ${endTime}`);
-    }
-    setAvailableSlots(slots);
+  // Follows the server-sent availability feed so slots taken by someone else
+  // disappear while the screen is open. React Native has no EventSource, so
+  // the stream is read incrementally from an XMLHttpRequest. The grid is
+  // filled from the REST endpoint whenever the feed is not delivering, and
+  // dropped feeds reconnect with exponential backoff.
+  const subscribeToAvailability = (date: string) => {
+    let xhr: XMLHttpRequest | null = null;
+    let retryTimer: ReturnType<typeof setTimeout> | undefined;
+    let retryDelay = FEED_RETRY_MIN_MS;
+    let eventsSeen = 0;
+    let closed = false;
+
+    const showAvailability = (availability: { slots: { start_time: string; end_time: string }[] }) => {
+      const slots = availability.slots.map((slot) => `${slot.start_time} - ${slot.end_time}`);
+      setAvailableSlots(slots);
+      setSelectedSlot((current) => (current && slots.includes(current) ? current : null));
+    };
+
+    const loadSnapshot = async () => {
+      const seen = eventsSeen;
+      try {
+        const response = await axios.get(`${API_URL}/api/availability/${id}`, {
+          params: { search_date: date },
+        });
+        // A feed event that arrived meanwhile is newer than this snapshot
+        if (!closed && seen === eventsSeen) showAvailability(response.data);
+      } catch (error) {
+        console.error('Error fetching availability:', error);
+      }
+    };
+
+    const stop = (request: XMLHttpRequest) => {
+      request.onprogress = null;
+      request.onload = null;
+      request.onerror = null;
+      request.abort();
+    };
+
+    const reconnect = () => {
+      if (closed) return;
+      xhr = null;
+      loadSnapshot();
+      retryTimer = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, FEED_RETRY_MAX_MS);
+    };
+
+    const connect = () => {
+      const request = new XMLHttpRequest();
+      let parsed = 0;
+      xhr = request;
+      request.open('GET', `${API_URL}/api/availability/${id}/stream?search_date=${date}`);
+      request.setRequestHeader('Accept', 'text/event-stream');
+      request.onprogress = () => {
+        const events = request.responseText.slice(parsed).split('\n\n');
+        const complete = events.slice(0, -1);
+        parsed += complete.reduce((length, event) => length + event.length + 2, 0);
+        for (const event of complete) {
+          const data = event.split('\n').find((line) => line.startsWith('data: '));
+          if (!data) continue;
+          eventsSeen += 1;
+          retryDelay = FEED_RETRY_MIN_MS;
+          showAvailability(JSON.parse(data.slice('data: '.length)));
+        }
+        // responseText keeps every byte of the stream; a fresh request
+        // starts with the current availability, so nothing is missed
+        if (parsed > FEED_MAX_BUFFER) {
+          stop(request);
+          connect();
+        }
+      };
+      // The server ended the stream (or refused it, e.g. at capacity)
+      request.onload = reconnect;
+      request.onerror = () => {
+        console.error('Availability feed disconnected');
+        reconnect();
+      };
+      request.send();
+    };
+
+    loadSnapshot();
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (xhr) stop(xhr);
+    };
   };
 
   const openDatePicker = () => {
@@ -0,0 +1,41 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "playslot_test")
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture
+def server():
+    """The backend module with ``db`` pointed at a fresh in-memory database."""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import server as server_module
+
+    server_module.client = mongomock_motor.AsyncMongoMockClient()
+    server_module.db = server_module.client[os.environ["DB_NAME"]]
+    for cache in (server_module.session_cache, server_module.search_cache,
+                  server_module.availability_cache, server_module.venue_snapshots,
+                  server_module.idempotency_store.cache):
+        cache.clear()
+    asyncio.run(server_module.ensure_indexes())
+    return server_module
+
+
+@pytest.fixture
+def api(server):
+    """Run ``fn(client)`` against the app on a fresh event loop."""
+    import httpx
+
+    def run(fn):
+        async def main():
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await fn(client)
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,20 @@
+VENUE = {
+    "name": "Arena", "description": "d", "location": "Bangalore", "address": "a",
+    "owner_id": "owner", "categories": ["football"], "amenities": [], "price_per_hour": 1000,
+}
+
+
+def test_stream_abandoned_before_its_body_leaves_no_subscriber(api, server):
+    async def scenario(client):
+        venue_id = (await client.post("/api/venues", json=VENUE)).json()["_id"]
+        response = await server.stream_availability(venue_id, "2026-10-20")
+        abandoned = server.availability_hub.subscriber_count()
+        body = response.body_iterator
+        first = await body.__anext__()
+        subscribed = server.availability_hub.subscriber_count()
+        await body.aclose()
+        return abandoned, first.startswith(b"event: availability"), subscribed, server.availability_hub.stats()
+
+    abandoned, first_event, subscribed, stats = api(scenario)
+    assert (abandoned, first_event, subscribed) == (0, True, 1)
+    assert (stats["venues"], stats["subscribers"]) == (0, 0)
@@ -0,0 +1,74 @@
+import asyncio
+
+VENUE = {
+    "name": "Arena", "description": "d", "location": "Bangalore", "address": "a",
+    "owner_id": "owner", "categories": ["football"], "amenities": [], "price_per_hour": 1000,
+}
+DATES = [f"2026-11-0{day}" for day in range(1, 7)]
+
+
+async def book(client, venue_id, booking_date):
+    response = await client.post("/api/bookings", json={
+        "user_id": "u1", "venue_id": venue_id, "booking_date": booking_date,
+        "start_time": "18:00", "end_time": "19:00", "phone_number": "9999999999",
+    })
+    return response.json()["_id"]
+
+
+async def past_pages(client, limit):
+    ids, after = [], None
+    while True:
+        params = {"status": "past", "limit": limit, **({"after": after} if after else {})}
+        response = await client.get("/api/bookings/user/u1", params=params)
+        ids += [entry["_id"] for entry in response.json()]
+        after = response.headers.get("X-Next-Cursor")
+        if not after:
+            return ids
+
+
+def test_past_list_is_capped_and_paged_from_bookings(api, server, monkeypatch):
+    monkeypatch.setattr(server, "BOOKING_VIEW_PAST_LIMIT", 3)
+
+    async def scenario(client):
+        venue_id = (await client.post("/api/venues", json=VENUE)).json()["_id"]
+        ids = [await book(client, venue_id, booking_date) for booking_date in DATES]
+        for booking_id in ids:
+            await client.put(f"/api/bookings/{booking_id}/status", params={"status": "cancelled"})
+        view = await server.db.user_booking_views.find_one({"user_id": "u1"})
+        return ids, view, await past_pages(client, limit=2)
+
+    ids, view, paged = api(scenario)
+    assert [entry["_id"] for entry in view["past"]] == ids[3:]
+    assert view["past_trimmed_date"] == DATES[2]
+    assert paged == ids[::-1]
+
+
+def test_sweeps_move_finished_entries_out_of_upcoming(api, server):
+    async def scenario(client):
+        venue_id = (await client.post("/api/venues", json=VENUE)).json()["_id"]
+        booking_id = await book(client, venue_id, DATES[0])
+        await server.transition_bookings({"_id": server.ObjectId(booking_id)}, "expired")
+        view = await server.db.user_booking_views.find_one({"user_id": "u1"})
+        return booking_id, view
+
+    booking_id, view = api(scenario)
+    assert view["upcoming"] == []
+    assert [(entry["_id"], entry["status"]) for entry in view["past"]] == [(booking_id, "expired")]
+
+
+def test_view_created_by_a_write_keeps_older_bookings(api, server):
+    async def scenario(client):
+        venue_id = (await client.post("/api/venues", json=VENUE)).json()["_id"]
+        older = await server.db.bookings.insert_one({
+            "user_id": "u1", "venue_id": venue_id, "venue_name": "Arena", "booking_date": DATES[0],
+            "start_time": "08:00", "end_time": "09:00", "total_price": 1000.0,
+            "status": "confirmed", "payment_status": "completed",
+        })
+        newer = await book(client, venue_id, DATES[1])
+        response = await client.get("/api/bookings/user/u1")
+        view = await server.db.user_booking_views.find_one({"user_id": "u1"})
+        return [str(older.inserted_id), newer], [entry["_id"] for entry in response.json()], view
+
+    ids, listed, view = api(scenario)
+    assert sorted(listed) == sorted(ids)
+    assert view["complete"] is True
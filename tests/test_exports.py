@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.mark.parametrize("export", ["bookings", "reviews"])
+@pytest.mark.parametrize("dates", [{"from_date": "2026-1-5"}, {"to_date": "2026-10-32"}, {"from_date": "yesterday"}])
+def test_export_rejects_malformed_dates(api, export, dates):
+    async def scenario(client):
+        response = await client.get(f"/api/{export}/venue/v1/export", params=dates)
+        return response.status_code
+
+    assert api(scenario) == 400
+
+
+@pytest.mark.parametrize("export", ["bookings", "reviews"])
+def test_export_accepts_iso_dates(api, export):
+    async def scenario(client):
+        response = await client.get(
+            f"/api/{export}/venue/v1/export", params={"from_date": "2026-01-05", "to_date": "2026-10-31"}
+        )
+        return response.status_code
+
+    assert api(scenario) == 200
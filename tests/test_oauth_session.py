@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import server
+
+USER = {"id": "u1", "email": "player@example.com", "name": "Player", "session_token": "token"}
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Point fetch_oauth_session at a stand-in provider replaying ``responses``."""
+    requests = []
+    responses = []
+
+    def handler(request):
+        requests.append(request)
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(server, "oauth_breaker", server.CircuitBreaker(2, 30))
+    monkeypatch.setattr(server.asyncio, "sleep", no_sleep)
+
+    def fetch(*replies):
+        responses[:] = replies
+
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                monkeypatch.setattr(server, "http_client", client)
+                return await server.fetch_oauth_session("session-1")
+        return asyncio.run(main())
+    fetch.requests = requests
+    return fetch
+
+
+def test_success(provider):
+    assert provider(httpx.Response(200, json=USER)) == USER
+    assert provider.requests[0].headers["X-Session-ID"] == "session-1"
+
+
+def test_retries_unavailable_provider(provider):
+    assert provider(httpx.Response(503), httpx.ConnectError("refused"), httpx.Response(200, json=USER)) == USER
+    assert len(provider.requests) == 3
+    assert server.oauth_breaker.failures == 0
+
+
+def test_rejected_session_is_401_without_retry(provider):
+    with pytest.raises(HTTPException) as error:
+        provider(httpx.Response(401))
+    assert error.value.status_code == 401
+    assert len(provider.requests) == 1
+    assert server.oauth_breaker.state == "closed"
+
+
+def test_breaker_opens_after_repeated_outages(provider):
+    attempts = server.OAUTH_MAX_RETRIES + 1
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            provider(*[httpx.Response(503)] * attempts)
+        assert error.value.status_code == 503
+    assert server.oauth_breaker.state == "open"
+
+    with pytest.raises(HTTPException) as error:
+        provider()
+    assert error.value.status_code == 503
+    assert len(provider.requests) == 2 * attempts
+    assert server.oauth_breaker.rejected == 1
+
+
+def test_provider_errors_count_as_outages(provider):
+    attempts = server.OAUTH_MAX_RETRIES + 1
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            provider(*[httpx.Response(500)] * attempts)
+        assert error.value.status_code == 503
+    assert len(provider.requests) == 2 * attempts
+    assert server.oauth_breaker.state == "open"
+
+
+def test_retried_google_callback_reuses_the_session(api, server, monkeypatch):
+    async def fetch(session_id):
+        return dict(USER)
+
+    monkeypatch.setattr(server, "fetch_oauth_session", fetch)
+
+    async def scenario(client):
+        responses = [
+            await client.post("/api/auth/google/callback", params={"session_id": "session-1"})
+            for _ in range(2)
+        ]
+        sessions = await server.db.user_sessions.count_documents({"session_token": "token"})
+        return [response.status_code for response in responses], sessions
+
+    assert api(scenario) == ([200, 200], 1)
@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+DATE = "2026-10-20"
+VENUE = {
+    "name": "Arena", "description": "d", "location": "Bangalore", "address": "a",
+    "owner_id": "owner", "categories": ["football"], "amenities": [], "price_per_hour": 1000,
+}
+
+
+def booking(venue_id, start, end, user="u1"):
+    return {
+        "user_id": user, "venue_id": venue_id, "booking_date": DATE,
+        "start_time": start, "end_time": end, "phone_number": "9999999999",
+    }
+
+
+async def create_venue(client):
+    response = await client.post("/api/venues", json=VENUE)
+    return response.json()["_id"]
+
+
+async def pay(client, booking_id):
+    return await client.put(
+        f"/api/bookings/{booking_id}/payment",
+        params={"payment_status": "completed", "payment_id": f"pay_{booking_id}"},
+    )
+
+
+def test_burst_on_one_slot_books_it_once(api):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        responses = await asyncio.gather(*(
+            client.post("/api/bookings", json=booking(venue_id, "18:00", "19:00", f"u{i}"))
+            for i in range(20)
+        ))
+        return sorted(response.status_code for response in responses)
+
+    assert api(scenario) == [201] + [409] * 19
+
+
+def test_overlapping_booking_on_generated_grid_is_rejected(api, server):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        await client.post("/api/slots/bulk", json={
+            "venue_id": venue_id, "start_date": DATE, "end_date": DATE,
+            "open_time": "06:00", "close_time": "23:00",
+        })
+        first = await client.post("/api/bookings", json=booking(venue_id, "18:00", "20:00"))
+        second = await client.post("/api/bookings", json=booking(venue_id, "19:00", "20:00", "u2"))
+        slot = await server.db.slots.find_one({"venue_id": venue_id, "start_time": "19:00"})
+        return first.status_code, second.status_code, slot["booking_id"], first.json()["_id"]
+
+    first, second, holder, first_id = api(scenario)
+    assert (first, second) == (201, 409)
+    assert holder == first_id
+
+
+def test_overlapping_claims_with_different_start_times(server):
+    async def scenario():
+        won = await server.claim_slot("v1", DATE, "18:00", "20:00", "a")
+        lost = await server.claim_slot("v1", DATE, "19:00", "21:00", "b")
+        leftover = await server.db.slots.count_documents({"booking_id": "b"})
+        return won, lost, leftover
+
+    assert asyncio.run(scenario()) == (True, False, 0)
+
+
+def test_racing_holds_resolve_to_the_earlier_claim(server):
+    async def scenario():
+        # b has written its hold but not yet re-read the day; a claimed first
+        now = datetime.now(timezone.utc)
+        await server.db.slots.insert_one({
+            "venue_id": "v1", "booking_date": DATE, "start_time": "19:00", "end_time": "20:00",
+            "status": "held", "booking_id": "b", "held_at": now + timedelta(seconds=1),
+            "held_until": now + timedelta(minutes=10), "booking_end_time": "20:00",
+        })
+        a = await server.claim_interval("v1", DATE, "18:00", "20:00", "a", held_at=now)
+        b = await server.claim_interval("v1", DATE, "19:00", "20:00", "b",
+                                        held_at=now + timedelta(seconds=1))
+        return a, b
+
+    assert asyncio.run(scenario()) == (True, False)
+
+
+def test_payment_after_lapsed_hold_does_not_double_book(api, server):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        a = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "19:00"))).json()["_id"]
+        await server.db.slots.update_many(
+            {"booking_id": a}, {"$set": {"held_until": datetime.now(timezone.utc) - timedelta(minutes=1)}}
+        )
+        server.availability_cache.clear()
+        b = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "19:00", "u2"))).json()["_id"]
+        paid_b = await pay(client, b)
+        paid_a = await pay(client, a)
+        statuses = {
+            str(doc["_id"]): doc["status"] async for doc in server.db.bookings.find({}, {"status": 1})
+        }
+        return paid_b.status_code, paid_a.status_code, statuses[a], statuses[b]
+
+    assert api(scenario) == (200, 409, "refund_pending", "confirmed")
+
+
+def test_bulk_confirmation_reports_slot_taken(api, server):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        a = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "19:00"))).json()["_id"]
+        await server.db.slots.update_many(
+            {"booking_id": a}, {"$set": {"held_until": datetime.now(timezone.utc) - timedelta(minutes=1)}}
+        )
+        server.availability_cache.clear()
+        b = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "19:00", "u2"))).json()["_id"]
+        response = await client.post("/api/bookings/status/bulk", json={"updates": [
+            {"booking_id": b, "status": "confirmed"}, {"booking_id": a, "status": "confirmed"},
+        ]})
+        a_doc = await server.db.bookings.find_one({"_id": server.ObjectId(a)})
+        return response.json()["results"], a_doc["status"]
+
+    results, a_status = api(scenario)
+    assert [result["ok"] for result in results] == [True, False]
+    assert results[1]["error"] == "slot_taken"
+    assert a_status == "pending"
+
+
+def test_startup_fails_without_unique_slot_index(server):
+    async def scenario():
+        await server.db.slots.drop_indexes()
+        slot = {"venue_id": "v1", "booking_date": DATE, "start_time": "18:00", "end_time": "19:00"}
+        await server.db.slots.insert_many([dict(slot), dict(slot)])
+        await server.ensure_indexes()
+
+    with pytest.raises(RuntimeError, match="venue_date_start_unique"):
+        asyncio.run(scenario())
+
+
+def grid(venue_id):
+    return {"venue_id": venue_id, "start_date": DATE, "end_date": DATE, "open_time": "06:00", "close_time": "23:00"}
+
+
+def test_cancelling_removes_slots_the_hold_created(api):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        booking_id = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "20:00"))).json()["_id"]
+        await client.put(f"/api/bookings/{booking_id}/status", params={"status": "cancelled"})
+        available = await client.get(f"/api/slots/available/{venue_id}", params={"search_date": DATE})
+        generated = await client.post("/api/slots/bulk", json=grid(venue_id))
+        return available.json(), generated.json()["skipped_duplicates"]
+
+    assert api(scenario) == ([], 0)
+
+
+def test_grid_generated_during_a_hold_keeps_its_slot(api, server):
+    async def scenario(client):
+        venue_id = await create_venue(client)
+        booking_id = (await client.post("/api/bookings", json=booking(venue_id, "18:00", "20:00"))).json()["_id"]
+        await client.post("/api/slots/bulk", json=grid(venue_id))
+        await client.put(f"/api/bookings/{booking_id}/status", params={"status": "cancelled"})
+        return await server.db.slots.find_one({"venue_id": venue_id, "start_time": "18:00"})
+
+    slot = api(scenario)
+    assert (slot["status"], slot["end_time"], "created_by_hold" in slot) == ("available", "19:00", False)
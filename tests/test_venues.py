@@ -0,0 +1,31 @@
+import pytest
+
+VENUE = {
+    "name": "Arena", "description": "d", "location": "Bangalore", "address": "a",
+    "owner_id": "owner", "categories": ["football"], "amenities": [], "price_per_hour": 1000,
+}
+
+
+@pytest.mark.parametrize("hours", [
+    {"opening_time": "6am"},
+    {"opening_time": "06:00", "closing_time": "05:00"},
+    {"opening_time": "10:00", "closing_time": "10:00"},
+    {"closing_time": "25:00"},
+])
+def test_invalid_opening_hours_are_rejected(api, hours):
+    async def scenario(client):
+        created = await client.post("/api/venues", json={**VENUE, **hours})
+        venue_id = (await client.post("/api/venues", json=VENUE)).json()["_id"]
+        updated = await client.put(f"/api/venues/{venue_id}", json={**VENUE, **hours})
+        availability = await client.get(f"/api/availability/{venue_id}", params={"search_date": "2026-10-20"})
+        return created.status_code, updated.status_code, availability.status_code
+
+    assert api(scenario) == (400, 400, 200)
+
+
+def test_opening_hours_are_normalized(api):
+    async def scenario(client):
+        response = await client.post("/api/venues", json={**VENUE, "opening_time": "6:00", "closing_time": "24:00"})
+        return response.json()["opening_time"], response.json()["closing_time"]
+
+    assert api(scenario) == ("06:00", "24:00")